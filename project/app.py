@@ -1,10 +1,14 @@
 import flet as ft
+import asyncio
 import os
+import time
+from collections import OrderedDict
 
 from student import Student
 from file_manager import FileManager
+from async_file_manager import AsyncFileManager
 
-def main(page: ft.Page):
+async def main(page: ft.Page):
     page.title = "Student File Management System"
     page.theme_mode = ft.ThemeMode.LIGHT
     page.theme = ft.Theme(color_scheme_seed="teal")
@@ -15,6 +19,67 @@ def main(page: ft.Page):
     # Global state
     current_file = None
     
+    # Compression, decompression and conversion use one worker per core
+    cpu_workers = os.cpu_count() or 1
+    
+    # File operations run off the UI event loop, one at a time
+    files = AsyncFileManager()
+    
+    # View All shows one page of records at a time and keeps the last few
+    # pages (the current one and its prefetched neighbours) in memory
+    PAGE_SIZE = 50
+    PAGE_CACHE_SIZE = 5
+    
+    # Long operations report progress in this bar and can be cancelled
+    running_task = None
+    # Change listener of the View All page while it is shown
+    view_listener = None
+    progress_text = ft.Text()
+    
+    def cancel_click(e):
+        if running_task is not None:
+            running_task.cancel()
+    
+    busy_bar = ft.Container(
+        visible=False,
+        padding=10,
+        bgcolor="surfaceVariant",
+        content=ft.Row([
+            ft.ProgressRing(width=16, height=16, stroke_width=2),
+            progress_text,
+            ft.TextButton("Cancel", on_click=cancel_click, icon="cancel"),
+        ]),
+    )
+    
+    async def run_long(label, unit, method, *args, **kwargs):
+        """
+        Awaits a cancellable AsyncFileManager call while showing its progress.
+        Raises asyncio.CancelledError if the user cancelled it.
+        """
+        nonlocal running_task
+        if running_task is not None:
+            raise RuntimeError("Another file operation is still running.")
+        
+        def report(count):
+            progress_text.value = f"{label}... {count:,} {unit}"
+            progress_text.update()
+        
+        progress_text.value = f"{label}..."
+        busy_bar.visible = True
+        page.update()
+        running_task = asyncio.ensure_future(method(*args, progress=report, **kwargs))
+        try:
+            return await running_task
+        finally:
+            running_task = None
+            busy_bar.visible = False
+            page.update()
+    
+    def show_cancelled():
+        page.snack_bar = ft.SnackBar(ft.Text("Operation cancelled."), bgcolor="orange")
+        page.snack_bar.open = True
+        page.update()
+    
     # --- UI Components (Global to Main) ---
     
     def toggle_theme(e):
@@ -30,6 +95,8 @@ def main(page: ft.Page):
         options=[
             ft.dropdown.Option(FileManager.TYPE_FIXED),
             ft.dropdown.Option(FileManager.TYPE_DELIMITED),
+            ft.dropdown.Option(FileManager.TYPE_BINARY),
+            ft.dropdown.Option(FileManager.TYPE_COLUMNAR),
         ],
         value=FileManager.TYPE_FIXED,
         border="underline", filled=True
@@ -41,7 +108,7 @@ def main(page: ft.Page):
         active_file_text.update()
 
     # File Pickers
-    def pick_files_result(e: ft.FilePickerResultEvent):
+    async def pick_files_result(e: ft.FilePickerResultEvent):
         if e.files:
             selected_file = e.files[0].path
             nonlocal current_file
@@ -52,7 +119,7 @@ def main(page: ft.Page):
             file_name_input.update()
             
             try:
-                meta = FileManager.get_file_metadata(current_file)
+                meta = await files.get_file_metadata(current_file)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Selected '{current_file}'. Type: {meta.get('TYPE')}"), bgcolor="blue")
                 page.snack_bar.open = True
                 update_active_file_text()
@@ -65,19 +132,21 @@ def main(page: ft.Page):
     pick_files_dialog = ft.FilePicker(on_result=pick_files_result)
     page.overlay.append(pick_files_dialog)
 
-    def csv_picker_result(e: ft.FilePickerResultEvent):
+    async def csv_picker_result(e: ft.FilePickerResultEvent):
         if e.files:
             csv_path = e.files[0].path
             target_file = file_name_input.value
             target_type = file_type_dropdown.value
             try:
-                FileManager.import_from_csv(csv_path, target_file, target_type)
+                await run_long("Importing", "records", files.import_from_csv, csv_path, target_file, target_type)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Imported from '{csv_path}' to '{target_file}'"), bgcolor="green")
                 page.snack_bar.open = True
                 nonlocal current_file
                 current_file = target_file
                 update_active_file_text()
                 page.update()
+            except asyncio.CancelledError:
+                show_cancelled()
             except Exception as ex:
                 page.snack_bar = ft.SnackBar(ft.Text(f"Import Error: {str(ex)}"), bgcolor="red")
                 page.snack_bar.open = True
@@ -86,17 +155,19 @@ def main(page: ft.Page):
     csv_import_dialog = ft.FilePicker(on_result=csv_picker_result)
     page.overlay.append(csv_import_dialog)
 
-    def on_gz_picked(e: ft.FilePickerResultEvent):
+    async def on_gz_picked(e: ft.FilePickerResultEvent):
         if e.files:
             gz_path = e.files[0].path
             try:
-                decomp_file = FileManager.decompress_file(gz_path)
+                decomp_file = await run_long("Decompressing", "bytes", files.decompress_file, gz_path, workers=cpu_workers)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Decompressed to '{decomp_file}'"), bgcolor="green")
                 page.snack_bar.open = True
                 nonlocal current_file
                 current_file = decomp_file
                 update_active_file_text()
                 page.update()
+            except asyncio.CancelledError:
+                show_cancelled()
             except Exception as ex:
                 page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
                 page.snack_bar.open = True
@@ -105,14 +176,16 @@ def main(page: ft.Page):
     gz_picker = ft.FilePicker(on_result=on_gz_picked)
     page.overlay.append(gz_picker)
 
-    def on_file_to_compress_picked(e: ft.FilePickerResultEvent):
+    async def on_file_to_compress_picked(e: ft.FilePickerResultEvent):
         if e.files:
             file_path = e.files[0].path
             try:
-                comp_file = FileManager.compress_file(file_path)
+                comp_file = await run_long("Compressing", "bytes", files.compress_file, file_path, workers=cpu_workers)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Compressed to '{comp_file}'"), bgcolor="green")
                 page.snack_bar.open = True
                 page.update()
+            except asyncio.CancelledError:
+                show_cancelled()
             except Exception as ex:
                 page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
                 page.snack_bar.open = True
@@ -122,9 +195,9 @@ def main(page: ft.Page):
     page.overlay.append(compress_picker)
 
     # Actions
-    def create_file_click(e):
+    async def create_file_click(e):
         try:
-            FileManager.create_file(file_name_input.value, file_type_dropdown.value)
+            await files.create_file(file_name_input.value, file_type_dropdown.value)
             page.snack_bar = ft.SnackBar(ft.Text(f"File '{file_name_input.value}' created successfully!"), bgcolor="green")
             page.snack_bar.open = True
             nonlocal current_file
@@ -136,13 +209,23 @@ def main(page: ft.Page):
             page.snack_bar.open = True
             page.update()
 
-    def load_file_click(e):
+    async def load_file_click(e):
         if os.path.exists(file_name_input.value):
             nonlocal current_file
             current_file = file_name_input.value
             
-            # Check if it's a GZ file
+            # Check if it's a GZ file. Block-compressed archives can still be
+            # searched by ID or RRN without decompressing them.
             if current_file.endswith('.gz'):
+                 try:
+                     meta = await files.get_file_metadata(current_file)
+                     page.snack_bar = ft.SnackBar(ft.Text(f"Loaded block archive '{current_file}'. Type: {meta.get('TYPE')}. Search and RRN access work without decompressing."), bgcolor="blue")
+                     page.snack_bar.open = True
+                     update_active_file_text()
+                     page.update()
+                     return
+                 except Exception:
+                     pass
                  page.snack_bar = ft.SnackBar(ft.Text(f"Selected compressed file '{current_file}'. Please decompress it first."), bgcolor="orange")
                  page.snack_bar.open = True
                  update_active_file_text()
@@ -150,7 +233,7 @@ def main(page: ft.Page):
                  return
 
             try:
-                meta = FileManager.get_file_metadata(current_file)
+                meta = await files.get_file_metadata(current_file)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Loaded '{current_file}'. Type: {meta.get('TYPE')}"), bgcolor="blue")
                 page.snack_bar.open = True
                 update_active_file_text()
@@ -164,7 +247,7 @@ def main(page: ft.Page):
             page.snack_bar.open = True
             page.update()
 
-    def convert_click(e):
+    async def convert_click(e):
         nonlocal current_file
         if not current_file:
             page.snack_bar = ft.SnackBar(ft.Text("No active file to convert!"), bgcolor="red")
@@ -174,48 +257,78 @@ def main(page: ft.Page):
             
         try:
             # Toggle type
-            meta = FileManager.get_file_metadata(current_file)
+            meta = await files.get_file_metadata(current_file)
             current_type = meta.get('TYPE')
             new_type = FileManager.TYPE_DELIMITED if current_type == FileManager.TYPE_FIXED else FileManager.TYPE_FIXED
             
-            new_file = FileManager.convert_file_structure(current_file, new_type)
+            new_file = await run_long("Converting", "records", files.convert_file_structure,
+                                      current_file, new_type, workers=cpu_workers)
             
             page.snack_bar = ft.SnackBar(ft.Text(f"Converted to '{new_file}' ({new_type})"), bgcolor="green")
             page.snack_bar.open = True
             current_file = new_file
             update_active_file_text()
             page.update()
+        except asyncio.CancelledError:
+            show_cancelled()
         except Exception as ex:
             page.snack_bar = ft.SnackBar(ft.Text(f"Conversion Error: {str(ex)}"), bgcolor="red")
             page.snack_bar.open = True
             page.update()
 
-    def compress_click(e):
+    async def sort_click(e):
+        if not current_file:
+            page.snack_bar = ft.SnackBar(ft.Text("No active file to sort!"), bgcolor="red")
+            page.snack_bar.open = True
+            page.update()
+            return
+            
+        try:
+            await run_long("Sorting", "records", files.sort_file, current_file, "id")
+            page.snack_bar = ft.SnackBar(ft.Text(f"Sorted '{current_file}' by ID"), bgcolor="green")
+            page.snack_bar.open = True
+            page.update()
+        except asyncio.CancelledError:
+            show_cancelled()
+        except Exception as ex:
+            page.snack_bar = ft.SnackBar(ft.Text(f"Sort Error: {str(ex)}"), bgcolor="red")
+            page.snack_bar.open = True
+            page.update()
+
+    async def compress_click(e):
         if not current_file:
             # Allow picking a file to compress
             compress_picker.pick_files(allow_multiple=False)
             return
             
         try:
-            comp_file = FileManager.compress_file(current_file)
+            # COLUMNAR records have no single offset to index, so those files
+            # get a plain (non-searchable) gzip archive
+            meta = await files.get_file_metadata(current_file)
+            compress = files.compress_file if meta.get('TYPE') == FileManager.TYPE_COLUMNAR else files.compress_file_blocks
+            comp_file = await run_long("Compressing", "bytes", compress, current_file, workers=cpu_workers)
             page.snack_bar = ft.SnackBar(ft.Text(f"Compressed to '{comp_file}'"), bgcolor="green")
             page.snack_bar.open = True
             page.update()
+        except asyncio.CancelledError:
+            show_cancelled()
         except Exception as ex:
             page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
             page.snack_bar.open = True
             page.update()
 
-    def decompress_click(e):
+    async def decompress_click(e):
          nonlocal current_file
          if current_file and current_file.endswith('.gz'):
              try:
-                 decomp_file = FileManager.decompress_file(current_file)
+                 decomp_file = await run_long("Decompressing", "bytes", files.decompress_file, current_file, workers=cpu_workers)
                  page.snack_bar = ft.SnackBar(ft.Text(f"Decompressed to '{decomp_file}'"), bgcolor="green")
                  page.snack_bar.open = True
                  current_file = decomp_file
                  update_active_file_text()
                  page.update()
+             except asyncio.CancelledError:
+                 show_cancelled()
              except Exception as ex:
                  page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
                  page.snack_bar.open = True
@@ -223,6 +336,9 @@ def main(page: ft.Page):
          else:
              gz_picker.pick_files(allow_multiple=False, allowed_extensions=["gz"])
 
+    async def rail_change(e):
+        await navigate(e.control.selected_index)
+
     # Navigation Rail
     rail = ft.NavigationRail(
         selected_index=0,
@@ -244,7 +360,7 @@ def main(page: ft.Page):
                 icon="list_alt_outlined", selected_icon="list_alt", label="View All"
             ),
         ],
-        on_change=lambda e: navigate(e.control.selected_index),
+        on_change=rail_change,
     )
 
     # Content Area
@@ -252,7 +368,48 @@ def main(page: ft.Page):
 
     # --- Pages ---
 
-    def get_home_page():
+    async def get_stats_card():
+        # Served from the aggregate sidecar, so this doesn't scan the file
+        if not current_file or current_file.endswith('.gz'):
+            return ft.Container()
+        try:
+            stats = await files.department_stats(current_file)
+        except Exception:
+            return ft.Container()
+
+        rows = [
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(dept)),
+                ft.DataCell(ft.Text(str(agg['count']))),
+                ft.DataCell(ft.Text(f"{agg['mean']:.2f}")),
+                ft.DataCell(ft.Text(f"{agg['min']:.2f}")),
+                ft.DataCell(ft.Text(f"{agg['max']:.2f}")),
+            ])
+            for dept, agg in stats.items()
+        ]
+        return ft.Card(
+            elevation=2,
+            content=ft.Container(
+                padding=20,
+                content=ft.Column([
+                    ft.Text("Department Statistics", size=16, weight=ft.FontWeight.W_600),
+                    ft.DataTable(
+                        columns=[
+                            ft.DataColumn(ft.Text("Dept", weight=ft.FontWeight.BOLD)),
+                            ft.DataColumn(ft.Text("Students", weight=ft.FontWeight.BOLD), numeric=True),
+                            ft.DataColumn(ft.Text("Mean GPA", weight=ft.FontWeight.BOLD), numeric=True),
+                            ft.DataColumn(ft.Text("Min", weight=ft.FontWeight.BOLD), numeric=True),
+                            ft.DataColumn(ft.Text("Max", weight=ft.FontWeight.BOLD), numeric=True),
+                        ],
+                        rows=rows,
+                        heading_row_color="surfaceVariant",
+                    ),
+                ])
+            )
+        )
+
+    async def get_home_page():
+        stats_card = await get_stats_card()
         return ft.Container(
             padding=40,
             content=ft.Column(
@@ -282,6 +439,7 @@ def main(page: ft.Page):
                                 ft.Row([
                                     ft.ElevatedButton("Import CSV", on_click=lambda _: csv_import_dialog.pick_files(allow_multiple=False, allowed_extensions=["csv"]), icon="upload_file"),
                                     ft.ElevatedButton("Convert Structure", on_click=convert_click, icon="transform"),
+                                    ft.ElevatedButton("Sort by ID", on_click=sort_click, icon="sort"),
                                 ]),
                                 ft.Row([
                                     ft.ElevatedButton("Compress File", on_click=compress_click, icon="compress"),
@@ -299,7 +457,9 @@ def main(page: ft.Page):
                             ft.Icon("info", color="teal"),
                             active_file_text,
                         ])
-                    )
+                    ),
+                    ft.Divider(height=20, color="transparent"),
+                    stats_card,
                 ],
             )
         )
@@ -319,7 +479,7 @@ def main(page: ft.Page):
         gpa_field = ft.TextField(label="GPA (Float)", width=400, border="underline", filled=True)
         dept_field = ft.TextField(label="Department", width=400, border="underline", filled=True)
 
-        def save_student(e):
+        async def save_student(e):
             try:
                 s_id = int(id_field.value)
                 s_name = name_field.value
@@ -327,7 +487,7 @@ def main(page: ft.Page):
                 s_dept = dept_field.value
                 
                 student = Student(s_id, s_name, s_gpa, s_dept)
-                FileManager.add_student(current_file, student)
+                await files.add_student(current_file, student)
                 
                 page.snack_bar = ft.SnackBar(ft.Text("Student added successfully!"), bgcolor="green")
                 page.snack_bar.open = True
@@ -379,13 +539,13 @@ def main(page: ft.Page):
         search_id_field = ft.TextField(label="Search by ID", width=300, border="underline", filled=True)
         result_area = ft.Column()
         
-        rrn_field = ft.TextField(label="Search by RRN (Fixed Only)", width=300, border="underline", filled=True)
+        rrn_field = ft.TextField(label="Search by RRN (Fixed/Binary Only)", width=300, border="underline", filled=True)
 
-        def search_click(e):
+        async def search_click(e):
             result_area.controls.clear()
             try:
                 s_id = int(search_id_field.value)
-                student, time_ms = FileManager.search_student(current_file, s_id)
+                student, time_ms = await files.search_student(current_file, s_id)
                 
                 if student:
                     result_area.controls.append(
@@ -427,14 +587,13 @@ def main(page: ft.Page):
                 page.snack_bar.open = True
                 page.update()
 
-        def rrn_search_click(e):
+        async def rrn_search_click(e):
             result_area.controls.clear()
             try:
                 rrn = int(rrn_field.value)
                 # Measure time for RRN
-                import time
                 start = time.time()
-                student = FileManager.get_record_by_rrn(current_file, rrn)
+                student = await files.get_record_by_rrn(current_file, rrn)
                 end = time.time()
                 time_ms = (end - start) * 1000
                 
@@ -486,7 +645,7 @@ def main(page: ft.Page):
                         content=ft.Container(
                             padding=20,
                             content=ft.Column([
-                                ft.Text("RRN Access (Fixed-Length Only)", weight=ft.FontWeight.BOLD),
+                                ft.Text("RRN Access (Fixed-Length/Binary Only)", weight=ft.FontWeight.BOLD),
                                 ft.Row([rrn_field, ft.OutlinedButton("Go to RRN", on_click=rrn_search_click, icon="arrow_forward")]),
                             ])
                         )
@@ -499,46 +658,240 @@ def main(page: ft.Page):
             )
         )
 
-    def get_view_all_page():
+    async def get_view_all_page():
         if not current_file:
             return ft.Container(padding=40, content=ft.Text("Please select/create a file first!", size=20, color="red"))
 
-        students = FileManager.read_all(current_file)
-        
-        # Data Table
-        
-        def delete_student_click(e):
+        # Paged table: only the visible page is read from the file, by RRN
+        # or through an index when sorted
+        nonlocal view_listener
+        sort_fields = ['id', 'name', 'gpa', 'dept']
+        # 'students' mirrors the rows of the table; 'version' counts file changes
+        view = {'page': 0, 'pages': 1, 'total': 0, 'sort_by': None, 'descending': False,
+                'students': [], 'version': 0}
+        cache = OrderedDict()  # (page, sort_by, descending) -> (students, total)
+        background = set()
+
+        async def fetch(page_number):
+            key = (page_number, view['sort_by'], view['descending'])
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            version = view['version']
+            result = await files.read_page(current_file, page_number, PAGE_SIZE, view['sort_by'], view['descending'])
+            if version == view['version']:
+                # Pages read before a change are shown but not kept
+                cache[key] = result
+                while len(cache) > PAGE_CACHE_SIZE:
+                    cache.popitem(last=False)
+            return result
+
+        async def prefetch(page_number):
+            try:
+                await fetch(page_number)
+            except Exception:
+                pass  # Fetched again (and reported) if the page is opened
+
+        def in_background(coro):
+            task = asyncio.ensure_future(coro)
+            background.add(task)
+            task.add_done_callback(background.discard)
+
+        def update_pager():
+            view['pages'] = pages = max(1, -(-view['total'] // PAGE_SIZE))
+            page_number = view['page']
+            page_label.value = f"Page {page_number + 1} of {pages} ({view['total']:,} records)"
+            first_button.disabled = prev_button.disabled = page_number == 0
+            next_button.disabled = last_button.disabled = page_number >= pages - 1
+
+        async def load_page(page_number):
+            students, total = await fetch(page_number)
+            pages = max(1, -(-total // PAGE_SIZE))
+            if page_number >= pages and page_number > 0:
+                # The file shrank (e.g. compacted): show its last page
+                page_number = pages - 1
+                students, total = await fetch(page_number)
+
+            view.update(page=page_number, total=total, students=list(students))
+            table.rows = [make_row(s) for s in students]
+            update_pager()
+
+            for neighbour in (page_number + 1, page_number - 1):
+                if 0 <= neighbour < view['pages'] and (neighbour, view['sort_by'], view['descending']) not in cache:
+                    in_background(prefetch(neighbour))
+
+        # --- Incremental refresh: file changes patch the rows shown ---
+
+        def order_key(s):
+            # Same order as the index pages are read from
+            field = view['sort_by'] or ordered_by
+            return s.name.casefold() if field == 'name' else getattr(s, field)
+
+        def find_row(student):
+            for i, shown in enumerate(view['students']):
+                if (shown.id, shown.name, shown.gpa, shown.dept) == (student.id, student.name, student.gpa, student.dept):
+                    return i
+            return None
+
+        def remove_row(student):
+            i = find_row(student)
+            if i is not None:
+                del view['students'][i]
+                del table.rows[i]
+            if ordered_by or view['sort_by']:
+                view['total'] -= 1
+
+        def insert_row(student):
+            """
+            Inserts an added student if it belongs on this page. Returns False
+            when the page has to be re-read instead.
+            """
+            if not (ordered_by or view['sort_by']):
+                # New records go wherever the file puts them (end or reused slot)
+                return False
+            view['total'] += 1
+            shown = view['students']
+            keys = [order_key(s) for s in shown]
+            key = order_key(student)
+            if view['descending']:
+                pos = next((i for i, k in enumerate(keys) if k < key), len(keys))
+            else:
+                pos = next((i for i, k in enumerate(keys) if k > key), len(keys))
+            if pos == 0 and view['page'] > 0:
+                return False  # Belongs to an earlier page, shifting this one
+            if pos == len(shown) and len(shown) >= PAGE_SIZE:
+                return True  # Belongs to a later page
+            shown.insert(pos, student)
+            table.rows.insert(pos, make_row(student))
+            if len(shown) > PAGE_SIZE:
+                shown.pop()
+                table.rows.pop()
+            return True
+
+        def on_file_change(filename, kind, students):
+            if os.path.abspath(filename) != os.path.abspath(current_file):
+                return
+            view['version'] += 1
+            cache.clear()
+            reload = kind == 'reset'
+            if kind == 'delete':
+                for s in students:
+                    remove_row(s)
+            elif kind == 'add':
+                for s in students:
+                    reload = not insert_row(s) or reload
+            elif kind == 'update':
+                for old, new in students:
+                    i = find_row(old)
+                    if (ordered_by or view['sort_by']) and order_key(old) != order_key(new):
+                        remove_row(old)
+                        reload = not insert_row(new) or reload
+                    elif i is not None:
+                        view['students'][i] = new
+                        table.rows[i] = make_row(new)
+
+            if reload:
+                in_background(show_page(view['page']))
+                return
+            cache[(view['page'], view['sort_by'], view['descending'])] = (list(view['students']), view['total'])
+            update_pager()
+            table.update()
+            page_label.update()
+
+        async def show_page(page_number):
+            try:
+                await load_page(page_number)
+            except Exception as ex:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
+                page.snack_bar.open = True
+            page.update()
+
+        async def first_click(e):
+            await show_page(0)
+
+        async def prev_click(e):
+            await show_page(max(view['page'] - 1, 0))
+
+        async def next_click(e):
+            await show_page(min(view['page'] + 1, view['pages'] - 1))
+
+        async def last_click(e):
+            await show_page(view['pages'] - 1)
+
+        async def jump_click(e):
+            try:
+                page_number = int(jump_field.value) - 1
+            except ValueError:
+                page.snack_bar = ft.SnackBar(ft.Text("Invalid page number"), bgcolor="red")
+                page.snack_bar.open = True
+                page.update()
+                return
+            await show_page(min(max(page_number, 0), view['pages'] - 1))
+
+        async def sort_column(e):
+            # Sorting reads pages through the column's index
+            field = sort_fields[e.column_index]
+            previous = (view['sort_by'], view['descending'])
+            if view['sort_by'] == field:
+                view['descending'] = not view['descending']
+            else:
+                view['sort_by'], view['descending'] = field, False
+            try:
+                await load_page(0)
+            except Exception as ex:
+                view['sort_by'], view['descending'] = previous
+                page.snack_bar = ft.SnackBar(ft.Text(f"Sort Error: {str(ex)}"), bgcolor="red")
+                page.snack_bar.open = True
+                page.update()
+                return
+            table.sort_column_index = e.column_index
+            table.sort_ascending = not view['descending']
+            page.update()
+
+        async def delete_student_click(e):
             s_id = e.control.data
-            if FileManager.delete_student(current_file, s_id):
+            try:
+                deleted = await files.delete_student(current_file, s_id)
+            except Exception as ex:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"), bgcolor="red")
+                page.snack_bar.open = True
+                page.update()
+                return
+            if deleted:
+                # The row itself is removed by the change listener
                 page.snack_bar = ft.SnackBar(ft.Text(f"Student {s_id} deleted."), bgcolor="green")
                 page.snack_bar.open = True
-                navigate(3) # Refresh view
+                page.update()
             else:
                 page.snack_bar = ft.SnackBar(ft.Text("Error deleting student."), bgcolor="red")
                 page.snack_bar.open = True
                 page.update()
 
-        def export_csv_click(e):
+        async def export_csv_click(e):
             try:
                 output_path = "students_export.csv"
-                FileManager.export_to_csv(current_file, output_path)
+                await run_long("Exporting", "records", files.export_to_csv, current_file, output_path)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Exported to {output_path}"), bgcolor="green")
                 page.snack_bar.open = True
                 page.update()
+            except asyncio.CancelledError:
+                show_cancelled()
             except Exception as ex:
                 page.snack_bar = ft.SnackBar(ft.Text(f"Export Error: {str(ex)}"), bgcolor="red")
                 page.snack_bar.open = True
                 page.update()
 
-        def export_excel_click(e):
+        async def export_excel_click(e):
             try:
                 output_path = "students_export.xlsx"
-                FileManager.export_to_excel(current_file, output_path)
+                await run_long("Exporting", "records", files.export_to_excel, current_file, output_path)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Exported to {output_path}"), bgcolor="green")
                 page.snack_bar.open = True
                 page.update()
+            except asyncio.CancelledError:
+                show_cancelled()
             except ImportError:
-                page.snack_bar = ft.SnackBar(ft.Text("Pandas/OpenPyXL not installed."), bgcolor="orange")
+                page.snack_bar = ft.SnackBar(ft.Text("OpenPyXL not installed."), bgcolor="orange")
                 page.snack_bar.open = True
                 page.update()
             except Exception as ex:
@@ -547,35 +900,59 @@ def main(page: ft.Page):
                 page.update()
 
         columns = [
-            ft.DataColumn(ft.Text("ID", weight=ft.FontWeight.BOLD)),
-            ft.DataColumn(ft.Text("Name", weight=ft.FontWeight.BOLD)),
-            ft.DataColumn(ft.Text("GPA", weight=ft.FontWeight.BOLD)),
-            ft.DataColumn(ft.Text("Dept", weight=ft.FontWeight.BOLD)),
+            ft.DataColumn(ft.Text("ID", weight=ft.FontWeight.BOLD), numeric=True, on_sort=sort_column),
+            ft.DataColumn(ft.Text("Name", weight=ft.FontWeight.BOLD), on_sort=sort_column),
+            ft.DataColumn(ft.Text("GPA", weight=ft.FontWeight.BOLD), numeric=True, on_sort=sort_column),
+            ft.DataColumn(ft.Text("Dept", weight=ft.FontWeight.BOLD), on_sort=sort_column),
             ft.DataColumn(ft.Text("Actions", weight=ft.FontWeight.BOLD)),
         ]
         
-        rows = []
-        for s in students:
-            rows.append(
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(ft.Text(str(s.id))),
-                        ft.DataCell(ft.Text(s.name)),
-                        ft.DataCell(ft.Text(str(s.gpa))),
-                        ft.DataCell(ft.Text(s.dept)),
-                        ft.DataCell(
-                            ft.IconButton(
-                                icon="delete",
-                                icon_color="red",
-                                data=s.id,
-                                on_click=delete_student_click,
-                                tooltip="Delete Student"
-                            )
-                        ),
-                    ]
-                )
+        def make_row(s):
+            return ft.DataRow(
+                cells=[
+                    ft.DataCell(ft.Text(str(s.id))),
+                    ft.DataCell(ft.Text(s.name)),
+                    ft.DataCell(ft.Text(str(s.gpa))),
+                    ft.DataCell(ft.Text(s.dept)),
+                    ft.DataCell(
+                        ft.IconButton(
+                            icon="delete",
+                            icon_color="red",
+                            data=s.id,
+                            on_click=delete_student_click,
+                            tooltip="Delete Student"
+                        )
+                    ),
+                ]
             )
 
+        table = ft.DataTable(
+            columns=columns, 
+            rows=[], 
+            border=ft.border.all(1, "grey_200"),
+            vertical_lines=ft.border.BorderSide(1, "grey_200"),
+            horizontal_lines=ft.border.BorderSide(1, "grey_200"),
+            heading_row_color="surfaceVariant",
+        )
+        page_label = ft.Text()
+        first_button = ft.IconButton(icon="first_page", on_click=first_click, tooltip="First Page")
+        prev_button = ft.IconButton(icon="chevron_left", on_click=prev_click, tooltip="Previous Page")
+        next_button = ft.IconButton(icon="chevron_right", on_click=next_click, tooltip="Next Page")
+        last_button = ft.IconButton(icon="last_page", on_click=last_click, tooltip="Last Page")
+        jump_field = ft.TextField(label="Page", width=100, border="underline", filled=True)
+
+        ordered_by = None
+        try:
+            # DELIMITED files are paged in ID order even when unsorted;
+            # block archives always page by RRN
+            meta = await files.get_file_metadata(current_file)
+            if meta.get('TYPE') == FileManager.TYPE_DELIMITED and not current_file.endswith('.gz'):
+                ordered_by = 'id'
+            await load_page(0)
+        except Exception as ex:
+            page_label.value = f"Error reading file: {str(ex)}"
+        view_listener = files.add_listener(on_file_change)
+
         return ft.Container(
             padding=40,
             content=ft.Column(
@@ -591,32 +968,43 @@ def main(page: ft.Page):
                         elevation=2,
                         content=ft.Container(
                             padding=10,
-                            content=ft.DataTable(
-                                columns=columns, 
-                                rows=rows, 
-                                border=ft.border.all(1, "grey_200"),
-                                vertical_lines=ft.border.BorderSide(1, "grey_200"),
-                                horizontal_lines=ft.border.BorderSide(1, "grey_200"),
-                                heading_row_color="surfaceVariant",
-                            )
+                            content=table
                         )
                     ),
+                    ft.Row([
+                        first_button,
+                        prev_button,
+                        page_label,
+                        next_button,
+                        last_button,
+                        ft.Container(expand=True),
+                        jump_field,
+                        ft.OutlinedButton("Go", on_click=jump_click, icon="arrow_forward"),
+                    ]),
                 ],
                 scroll=ft.ScrollMode.AUTO,
                 expand=True
             )
         )
 
-    def navigate(index):
-        content_area.controls.clear()
+    async def navigate(index):
+        nonlocal view_listener
+        if view_listener is not None:
+            files.remove_listener(view_listener)
+            view_listener = None
+        # Pages that read the file are built before the old one is cleared
         if index == 0:
-            content_area.controls.append(get_home_page())
+            view = await get_home_page()
         elif index == 1:
-            content_area.controls.append(get_add_student_page())
+            view = get_add_student_page()
         elif index == 2:
-            content_area.controls.append(get_search_page())
+            view = get_search_page()
         elif index == 3:
-            content_area.controls.append(get_view_all_page())
+            view = await get_view_all_page()
+        else:
+            return
+        content_area.controls.clear()
+        content_area.controls.append(view)
         page.update()
 
     # Layout
@@ -625,7 +1013,7 @@ def main(page: ft.Page):
             [
                 rail,
                 ft.VerticalDivider(width=1),
-                content_area,
+                ft.Column([busy_bar, content_area], expand=True),
             ],
             expand=True,
         )
@@ -637,7 +1025,7 @@ def main(page: ft.Page):
     )
 
     # Init
-    navigate(0)
+    await navigate(0)
 
 if __name__ == "__main__":
     ft.app(target=main)
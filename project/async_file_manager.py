@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from file_manager import FileManager
+
+
+class _Cancelled(Exception):
+    """
+    Raised inside a worker thread to abandon a cancelled call.
+    """
+
+
+class AsyncFileManager:
+    """
+    Asyncio front end to FileManager for event-loop applications such as the
+    Flet UI. Every public FileManager method has an async counterpart with
+    the same arguments, e.g.
+
+        files = AsyncFileManager()
+        student, ms = await files.search_student("students.txt", 42)
+
+    Calls run in a thread pool of `max_workers` threads; further calls wait
+    for a free thread. FileManager calls on the same file must not overlap,
+    so the default runs them one at a time.
+
+    Methods that take a `progress` callback (imports, conversions, exports,
+    sorting, compression) can be cancelled: cancelling the awaiting task
+    makes the worker stop at its next progress report, and the task raises
+    CancelledError once the worker has stopped. progress itself, if given,
+    is called on the event loop. Other calls run to completion even when
+    their task is cancelled.
+    """
+
+    # FileManager methods mirrored as coroutines
+    METHODS = (
+        'create_file', 'get_file_metadata', 'add_student', 'add_students',
+        'read_all', 'read_batch', 'load_fixed_columns',
+        'find_by_dept', 'find_by_name_prefix', 'find_by_gpa_range', 'top_by_gpa',
+        'department_stats', 'search_student', 'get_record_by_rrn', 'read_page',
+        'delete_student', 'update_student', 'update_record_by_rrn', 'compact', 'sort_file',
+        'export_to_csv', 'export_to_excel', 'import_from_csv', 'convert_file_structure',
+        'compress_file', 'compress_file_blocks', 'decompress_file',
+    )
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='file-manager')
+
+    async def run(self, func, *args, progress=None, **kwargs):
+        """
+        Runs a blocking call in the executor and returns its result.
+        If func accepts a progress argument it is given a callback that
+        forwards to `progress` and checks for cancellation.
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+
+        if self._accepts_progress(func):
+            def report(count):
+                if cancelled.is_set():
+                    raise _Cancelled()
+                if progress is not None:
+                    loop.call_soon_threadsafe(progress, count)
+            kwargs['progress'] = report
+
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            # Let the worker reach its next report and clean up before
+            # the file is used again
+            try:
+                await future
+            except Exception:
+                pass
+            raise
+
+    @staticmethod
+    def _accepts_progress(func) -> bool:
+        try:
+            return 'progress' in inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            return False  # Builtins without a signature
+
+    async def iter_students(self, filename: str, workers: int = 1):
+        """
+        Asynchronously yields Student objects from the file. Records are read
+        in batches of FileManager.BATCH_SIZE in the executor.
+        """
+        batches = FileManager._batches(FileManager.iter_students(filename, workers), FileManager.BATCH_SIZE)
+        try:
+            while True:
+                batch = await self.run(next, batches, None)
+                if batch is None:
+                    return
+                for student in batch:
+                    yield student
+        finally:
+            batches.close()
+
+    def add_listener(self, listener):
+        """
+        Registers listener(filename, kind, students) for FileManager change
+        notifications (see FileManager.LISTENERS), delivered on the running
+        event loop. Returns the handle to pass to remove_listener.
+        """
+        loop = asyncio.get_running_loop()
+
+        def forward(filename, kind, students):
+            try:
+                loop.call_soon_threadsafe(listener, filename, kind, students)
+            except RuntimeError:
+                pass  # Event loop already closed
+        FileManager.add_listener(forward)
+        return forward
+
+    def remove_listener(self, handle):
+        FileManager.remove_listener(handle)
+
+    def query(self, filename: str):
+        """
+        Returns a FileManager query; run it with `await files.run(query.all)`.
+        """
+        return FileManager.query(filename)
+
+    def close(self):
+        """
+        Shuts the executor down without waiting; queued calls are cancelled.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _mirror(name: str):
+    func = getattr(FileManager, name)
+
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        return await self.run(func, *args, **kwargs)
+    return method
+
+
+for _name in AsyncFileManager.METHODS:
+    setattr(AsyncFileManager, _name, _mirror(_name))
@@ -0,0 +1,192 @@
+import struct
+import sys
+from array import array
+
+from student import Student
+
+
+class RowGroup:
+    """
+    Location, size and zone map of one row group in a COLUMNAR file.
+    `zones` maps each field to its (min, max) in the group; names and
+    departments are compared as fitted bytes, like the secondary index keys.
+    """
+
+    __slots__ = ('offset', 'rows', 'zones')
+
+    def __init__(self, offset: int, rows: int, zones: dict):
+        self.offset = offset
+        self.rows = rows
+        self.zones = zones
+
+
+class ColumnarFormat:
+    """
+    Encoding of COLUMNAR files. After the text header the file is a series
+    of row groups, each laid out as:
+
+        header    '<4sI'  magic, number of rows
+        zone map          min and max of every field
+        segments          one contiguous column per field, in
+                          Student.FIELD_LENGTHS order
+
+    IDs are int64 and GPAs float64 (little-endian), names and departments
+    fixed-width UTF-8 like FIXED records. A reader can check a group's zone
+    map and then seek straight to the one column segment it needs.
+    """
+
+    MAGIC = b'RGRP'
+    HEADER = struct.Struct('<4sI')
+
+    # Item format of each column segment
+    COLUMNS = {
+        'id': 'q',
+        'name': f"{Student.FIELD_LENGTHS['name']}s",
+        'gpa': 'd',
+        'dept': f"{Student.FIELD_LENGTHS['dept']}s",
+    }
+    WIDTHS = {field: struct.calcsize('<' + fmt) for field, fmt in COLUMNS.items()}
+    ZONES = struct.Struct('<' + ''.join(fmt * 2 for fmt in COLUMNS.values()))
+    ROW_WIDTH = sum(WIDTHS.values())
+
+    @staticmethod
+    def _zone_value(field: str, value):
+        """
+        Converts a field value to the form stored in zone maps and segments.
+        """
+        if field in ('name', 'dept'):
+            return Student._fit_bytes(value, Student.FIELD_LENGTHS[field])
+        return value
+
+    @staticmethod
+    def encode(students) -> bytes:
+        """
+        Encodes a list of students as one row group.
+        """
+        columns = {
+            'id': array('q', (s.id for s in students)),
+            'name': [ColumnarFormat._zone_value('name', s.name) for s in students],
+            'gpa': array('d', (s.gpa for s in students)),
+            'dept': [ColumnarFormat._zone_value('dept', s.dept) for s in students],
+        }
+        zones = []
+        segments = []
+        for field, values in columns.items():
+            zones.extend((min(values), max(values)))
+            if isinstance(values, array):
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                segments.append(values.tobytes())
+            else:
+                segments.append(b''.join(values))
+        return (ColumnarFormat.HEADER.pack(ColumnarFormat.MAGIC, len(students))
+                + ColumnarFormat.ZONES.pack(*zones) + b''.join(segments))
+
+    @staticmethod
+    def iter_groups(f, start: int):
+        """
+        Yields the RowGroup of every group from byte `start` of a binary
+        handle, reading only group headers and zone maps.
+        """
+        prefix = ColumnarFormat.HEADER.size + ColumnarFormat.ZONES.size
+        offset = start
+        while True:
+            f.seek(offset)
+            head = f.read(prefix)
+            if len(head) < prefix:
+                return
+            magic, rows = ColumnarFormat.HEADER.unpack_from(head)
+            if magic != ColumnarFormat.MAGIC:
+                raise ValueError(f"Corrupt row group at byte {offset}.")
+            values = ColumnarFormat.ZONES.unpack_from(head, ColumnarFormat.HEADER.size)
+            zones = {field: (values[2 * i], values[2 * i + 1])
+                     for i, field in enumerate(ColumnarFormat.COLUMNS)}
+            yield RowGroup(offset, rows, zones)
+            offset += prefix + rows * ColumnarFormat.ROW_WIDTH
+
+    @staticmethod
+    def _segment_offset(group: RowGroup, field: str) -> int:
+        offset = group.offset + ColumnarFormat.HEADER.size + ColumnarFormat.ZONES.size
+        for name in ColumnarFormat.COLUMNS:
+            if name == field:
+                return offset
+            offset += group.rows * ColumnarFormat.WIDTHS[name]
+        raise ValueError(f"Unknown field: {field}")
+
+    @staticmethod
+    def _decode_column(field: str, raw: bytes):
+        fmt = ColumnarFormat.COLUMNS[field]
+        if field in ('id', 'gpa'):
+            values = array(fmt)
+            values.frombytes(raw)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            return values
+        width = ColumnarFormat.WIDTHS[field]
+        return [raw[i:i + width].decode('utf-8').strip() for i in range(0, len(raw), width)]
+
+    @staticmethod
+    def read_segment(f, group: RowGroup, field: str) -> bytes:
+        """
+        Reads the raw column segment of one field in a group.
+        """
+        f.seek(ColumnarFormat._segment_offset(group, field))
+        return f.read(group.rows * ColumnarFormat.WIDTHS[field])
+
+    @staticmethod
+    def read_column(f, group: RowGroup, field: str):
+        """
+        Reads and decodes one column segment of a group: an array for id and
+        gpa, a list of str for name and dept.
+        """
+        return ColumnarFormat._decode_column(field, ColumnarFormat.read_segment(f, group, field))
+
+    @staticmethod
+    def read_students(f, group: RowGroup):
+        """
+        Reads every column of a group and returns its rows as Student objects.
+        """
+        ids, names, gpas, depts = (ColumnarFormat.read_column(f, group, field) for field in ColumnarFormat.COLUMNS)
+        return [Student(*row) for row in zip(ids, names, gpas, depts)]
+
+    @staticmethod
+    def read_row(f, group: RowGroup, position: int) -> Student:
+        """
+        Reads the single row at `position` in a group, one seek per column.
+        """
+        values = []
+        for field, width in ColumnarFormat.WIDTHS.items():
+            f.seek(ColumnarFormat._segment_offset(group, field) + position * width)
+            values.append(ColumnarFormat._decode_column(field, f.read(width))[0])
+        return Student(*values)
+
+    @staticmethod
+    def may_match(group: RowGroup, field: str, op: str, value) -> bool:
+        """
+        False only if the zone map proves no row of the group satisfies
+        `field op value`. Numeric fields prune eq/in and range operators;
+        name and dept prune eq and startswith on their fitted bytes.
+        """
+        low, high = group.zones[field]
+        try:
+            if field in ('id', 'gpa'):
+                if op == 'eq':
+                    return low <= value <= high
+                if op == 'in':
+                    return any(low <= option <= high for option in value)
+                if op == 'lt':
+                    return low < value
+                if op == 'lte':
+                    return low <= value
+                if op == 'gt':
+                    return high > value
+                if op == 'gte':
+                    return high >= value
+            elif op == 'eq':
+                return low <= ColumnarFormat._zone_value(field, value) <= high
+            elif op == 'startswith':
+                prefix = ColumnarFormat._zone_value(field, value).rstrip()
+                return low[:len(prefix)] <= prefix <= high[:len(prefix)]
+        except TypeError:
+            pass
+        return True
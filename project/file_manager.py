@@ -1,30 +1,129 @@
+import mmap
 import os
 import time
+from collections import deque
 from datetime import datetime
-from student import Student
+from student import Student, StudentBatch
+from record_index import SortedIndex, AvailList, DeptStats, BlockIndex
+from columnar import ColumnarFormat
 
 class FileManager:
     """
     Manages file operations for student records.
-    Supports Fixed-Length and Delimited formats.
+    Supports Fixed-Length, Delimited, packed Binary and Columnar formats.
     """
     
     TYPE_FIXED = "FIXED"
     TYPE_DELIMITED = "DELIMITED"
+    TYPE_BINARY = "BINARY"
+    # Row groups of per-field column segments with min/max zone maps (see
+    # columnar.ColumnarFormat). Append-only: records have no single offset,
+    # so they can't be indexed, updated or deleted in place.
+    TYPE_COLUMNAR = "COLUMNAR"
+    FILE_TYPES = (TYPE_FIXED, TYPE_DELIMITED, TYPE_BINARY, TYPE_COLUMNAR)
+    
+    # Types whose records all take one same-size slot, which allows RRN
+    # access, in-place updates and slot reuse
+    SLOT_TYPES = (TYPE_FIXED, TYPE_BINARY)
     
     # Header constants
     HEADER_PREFIX = "HEADER:"
     
+    # Primary key index (ID -> byte offset), stored as <data file>.idx
+    ID_INDEX = SortedIndex('.idx', 'id', 'q')
+    
+    # Optional secondary indexes, built by the first query that needs them.
+    # Keys are the field fitted to its fixed-record width; names are casefolded
+    # so prefix lookups ignore case.
+    DEPT_INDEX = SortedIndex('.dept.idx', 'dept', f"{Student.FIELD_LENGTHS['dept']}s",
+                             lambda dept: Student._fit_bytes(dept, Student.FIELD_LENGTHS['dept']))
+    NAME_INDEX = SortedIndex('.name.idx', 'name', f"{Student.FIELD_LENGTHS['name']}s",
+                             lambda name: Student._fit_bytes(name.casefold(), Student.FIELD_LENGTHS['name']))
+    GPA_INDEX = SortedIndex('.gpa.idx', 'gpa', 'd', float)
+    
+    # Every index kept current by the mutation methods
+    INDEXES = (ID_INDEX, DEPT_INDEX, NAME_INDEX, GPA_INDEX)
+    
+    # Per-department GPA aggregates (<data file>.stats), built on first read
+    STATS = DeptStats('.stats')
+    
+    # Deleted records are marked with this byte in their first position and
+    # their offsets pushed on the avail list (<data file>.avail)
+    TOMBSTONE = b'*'
+    # Binary records are marked by their reserved ID instead, since any byte
+    # value can start a packed ID
+    BINARY_TOMBSTONE = Student.BINARY_DELETED_ID.to_bytes(4, 'little')
+    AVAIL_LIST = AvailList('.avail')
+    
+    # delete_student compacts the file once this fraction of slots is dead
+    COMPACT_RATIO = 0.5
+    
+    # Parallel loads split the file into ranges of about this many bytes and
+    # are only used for files of at least PARALLEL_MIN_SIZE bytes
+    PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
+    PARALLEL_MIN_SIZE = 4 * 1024 * 1024
+    
+    # Bulk reads and writes encode/decode this many records per batch
+    BATCH_SIZE = 8192
+    
+    # sort_file sorts runs of at most this many records in memory
+    SORT_RUN_RECORDS = 100000
+    # and merges at most this many runs at once; more runs are first merged
+    # into intermediate runs, keeping the number of open files bounded
+    SORT_MERGE_FAN_IN = 64
+    
+    # Rows per Excel worksheet, header included; larger exports continue
+    # on further sheets
+    EXCEL_MAX_ROWS = 1048576
+    
+    # Block-compressed archives compress every BLOCK_RECORDS records as a
+    # separate gzip member. <archive>.blocks locates the members and
+    # <archive>.rrn.idx maps IDs to RRNs, so a lookup decompresses one block.
+    # Its suffix differs from ID_INDEX's, whose entries are byte offsets.
+    BLOCK_RECORDS = 4096
+    BLOCK_INDEX = BlockIndex('.blocks')
+    ARCHIVE_ID_INDEX = SortedIndex('.rrn.idx', 'id', 'q')
+    
+    # compress_file writes one gzip member per GZIP_CHUNK_SIZE bytes of input.
+    # Each member carries its own total size in a GZIP_SIZE_FIELD extra
+    # subfield (ignored by other gzip readers), so decompress_file can hand
+    # members to parallel workers without inflating the file first.
+    GZIP_CHUNK_SIZE = 1024 * 1024
+    GZIP_SIZE_FIELD = b'SZ'
+    
+    # Change listeners, called as listener(filename, kind, students) on the
+    # thread that changed the file: 'add' and 'delete' with the students
+    # added or removed (adds in batches of up to BATCH_SIZE), 'update' with
+    # (old, new) pairs, and 'reset' with an empty list when the file was
+    # created or rewritten as a whole.
+    LISTENERS = []
+    
+    @staticmethod
+    def add_listener(listener):
+        FileManager.LISTENERS.append(listener)
+    
+    @staticmethod
+    def remove_listener(listener):
+        if listener in FileManager.LISTENERS:
+            FileManager.LISTENERS.remove(listener)
+    
+    @staticmethod
+    def _notify(filename: str, kind: str, students):
+        for listener in list(FileManager.LISTENERS):
+            listener(filename, kind, students)
+    
     @staticmethod
     def create_file(filename: str, file_type: str, delimiter: str = "|"):
         """
         Creates a new file with a header record.
         Header format: HEADER:TYPE=FIXED,DATE=2023-10-27
         or HEADER:TYPE=DELIMITED,DELIMITER=|,DATE=2023-10-27
+        BINARY and COLUMNAR files have a text header like FIXED ones, followed
+        by packed records or row groups.
         """
         date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        if file_type == FileManager.TYPE_FIXED:
+        if file_type != FileManager.TYPE_DELIMITED:
             # For fixed, we might store field lengths in header, but for this assignment
             # we know them from Student class. We'll store basic metadata.
             header = f"{FileManager.HEADER_PREFIX}TYPE={file_type},DATE={date_str},FIELDS=ID|Name|GPA|Dept"
@@ -34,17 +133,43 @@ class FileManager:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(header + "\n")
             
+        # Any sidecar left over from a previous file with this name is invalid
+        FileManager._remove_sidecars(filename)
+        FileManager._notify(filename, 'reset', [])
+
+    @staticmethod
+    def _remove_sidecars(filename: str):
+        """
+        Deletes the index, stats and avail-list files kept next to a data file.
+        """
+        for index in FileManager.INDEXES:
+            index.remove_file(filename)
+        FileManager.STATS.remove_file(filename)
+        FileManager.AVAIL_LIST.remove_file(filename)
+            
     @staticmethod
     def get_file_metadata(filename: str):
         """
         Reads the header and returns metadata dict.
+        Also works on block-compressed archives, whose header is their first block.
         """
         if not os.path.exists(filename):
             raise FileNotFoundError("File does not exist.")
             
-        with open(filename, 'r', encoding='utf-8') as f:
-            header_line = f.readline().strip()
+        if FileManager._is_block_archive(filename):
+            header_line = FileManager._archive_header(filename).decode('utf-8').strip()
+        else:
+            # Binary mode: only the header line is text in BINARY files
+            with open(filename, 'rb') as f:
+                header_line = f.readline().decode('utf-8').strip()
             
+        return FileManager._parse_header(header_line)
+
+    @staticmethod
+    def _parse_header(header_line: str) -> dict:
+        """
+        Parses a header line (without newline) into a metadata dict.
+        """
         if not header_line.startswith(FileManager.HEADER_PREFIX):
             raise ValueError("Invalid file format: Missing header.")
             
@@ -63,128 +188,852 @@ class FileManager:
     def add_student(filename: str, student: Student):
         """
         Appends a student record to the file.
+        FIXED and BINARY files reuse the slot of a deleted record when one is available.
+        On a COLUMNAR file each call appends a one-row group; use add_students
+        for bulk loads.
+        """
+        with FileManager.open(filename) as records:
+            records.add(student)
+
+    @staticmethod
+    def add_students(filename: str, students, progress=None):
+        """
+        Appends many student records in one pass.
+        The header is read once and records are encoded in batches of
+        BATCH_SIZE and written through a single handle. On a COLUMNAR file
+        each batch becomes one row group.
+        If given, progress(count) is called after each batch with the number
+        of records written so far.
+        Returns the number of records written.
         """
         metadata = FileManager.get_file_metadata(filename)
+        terminator = FileManager._record_terminator(filename, metadata)
+        indexes = FileManager._current_indexes(filename)
+        has_stats = FileManager.STATS.is_current(filename)
+        FileManager._clear_sorted(filename, metadata)
+
+        offset = os.path.getsize(filename)
+        new_entries = {index: [] for index in indexes}
+        added = {}
+        count = 0
+
+        def sync(batch=None):
+            f.flush()
+            for index, entries in new_entries.items():
+                if entries:
+                    index.insert_many(filename, entries)
+                    entries.clear()
+            if has_stats and added:
+                FileManager.STATS.update(filename, added)
+                added.clear()
+            if batch is not None:
+                FileManager._notify(filename, 'add', batch)
+
+        with open(filename, 'ab') as f:
+            for batch in FileManager._batches(students, FileManager.BATCH_SIZE):
+                stored, stride = batch, None
+                if metadata.get('TYPE') == FileManager.TYPE_FIXED:
+                    data = Student.encode_fixed_batch(batch, terminator)
+                    stride = Student.RECORD_LENGTH + len(terminator)
+                    offsets = range(offset, offset + len(data), stride)
+                elif metadata.get('TYPE') == FileManager.TYPE_BINARY:
+                    data = Student.encode_binary_batch(batch)
+                    stride = Student.BINARY_STRUCT.size
+                    offsets = range(offset, offset + len(data), stride)
+                elif metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+                    data = ColumnarFormat.encode(batch)
+                    offsets = ()
+                elif metadata.get('TYPE') == FileManager.TYPE_DELIMITED and not new_entries:
+                    # No index needs the offsets of variable-length records
+                    data = Student.encode_delimited_batch(batch, metadata.get('DELIMITER', '|'), terminator)
+                    offsets = ()
+                else:
+                    records = [FileManager._encode_record(s, metadata) + terminator for s in batch]
+                    offsets = []
+                    record_offset = offset
+                    for record in records:
+                        offsets.append(record_offset)
+                        record_offset += len(record)
+                    data = b''.join(records)
+
+                if (new_entries or has_stats) and offsets:
+                    stored = FileManager._as_stored(batch, data, stride, metadata)
+                for index, entries in new_entries.items():
+                    entries.extend((index.key_of(s), o) for s, o in zip(stored, offsets))
+                if has_stats:
+                    for s in stored:
+                        DeptStats.accumulate(added, s)
+
+                f.write(data)
+                offset += len(data)
+                count += len(batch)
+                # Listeners must find each batch on disk and in the sidecars;
+                # without listeners the sidecars are updated once at the end
+                if FileManager.LISTENERS:
+                    sync(batch)
+                if progress is not None:
+                    progress(count)
+            sync()
+        return count
+
+    @staticmethod
+    def _batches(iterable, size: int):
+        """
+        Groups an iterable into lists of at most `size` items.
+        """
+        batch = []
+        for item in iterable:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _encode_record(student: Student, metadata: dict) -> bytes:
+        """
+        Serializes a student to record bytes (without newline) according to
+        the file type in the metadata.
+        """
         file_type = metadata.get('TYPE')
-        
-        with open(filename, 'a', encoding='utf-8') as f:
-            if file_type == FileManager.TYPE_FIXED:
-                record = student.to_fixed_length()
-                f.write(record + "\n")
-            elif file_type == FileManager.TYPE_DELIMITED:
-                delimiter = metadata.get('DELIMITER', '|')
-                record = student.to_delimited(delimiter)
-                f.write(record + "\n")
-            else:
-                raise ValueError(f"Unknown file type: {file_type}")
+        if file_type == FileManager.TYPE_FIXED:
+            return student.to_fixed_bytes()
+        elif file_type == FileManager.TYPE_BINARY:
+            return student.to_binary_bytes()
+        elif file_type == FileManager.TYPE_DELIMITED:
+            return student.to_delimited(metadata.get('DELIMITER', '|')).encode('utf-8')
+        else:
+            raise ValueError(f"Unknown file type: {file_type}")
 
     @staticmethod
-    def read_all(filename: str):
+    def _decode_record(line: str, metadata: dict) -> Student:
+        """
+        Parses one record line (without newline) according to the file type.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_FIXED:
+            return Student.from_fixed_length(line)
+        return Student.from_delimited(line, metadata.get('DELIMITER', '|'))
+
+    @staticmethod
+    def _newline(filename: str) -> bytes:
+        """
+        Returns the newline bytes used by the file, detected from its header.
+        """
+        with open(filename, 'rb') as f:
+            header_bytes = f.readline()
+        return b'\r\n' if header_bytes.endswith(b'\r\n') else b'\n'
+
+    @staticmethod
+    def _record_terminator(filename: str, metadata: dict) -> bytes:
+        """
+        Returns the bytes written after each record: the file's newline, or
+        nothing for BINARY files whose records are packed back to back.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return b''
+        return FileManager._newline(filename)
+
+    @staticmethod
+    def iter_students(filename: str, workers: int = 1):
+        """
+        Lazily yields Student objects from the file, one record at a time.
+        Memory use stays constant regardless of the file size.
+        With workers > 1, large files are parsed by a pool of processes and
+        the records are still yielded in file order.
+        COLUMNAR files are read one row group at a time.
+        """
+        with FileManager.open(filename) as records:
+            if (workers > 1 and records.type != FileManager.TYPE_COLUMNAR
+                    and os.path.getsize(filename) >= FileManager.PARALLEL_MIN_SIZE):
+                yield from FileManager._iter_parallel(filename, records.metadata, workers)
+                return
+            yield from records.scan()
+
+    @staticmethod
+    def _iter_row_groups(filename: str):
+        """
+        Yields the records of a COLUMNAR file as one list per row group.
+        """
+        with open(filename, 'rb') as f:
+            for group in ColumnarFormat.iter_groups(f, len(f.readline())):
+                yield ColumnarFormat.read_students(f, group)
+
+    @staticmethod
+    def read_all(filename: str, workers: int = 1):
         """
         Reads all student records from the file.
         Returns a list of Student objects.
         """
+        return list(FileManager.iter_students(filename, workers))
+
+    @staticmethod
+    def read_batch(filename: str, workers: int = 1) -> StudentBatch:
+        """
+        Reads all student records into a column-oriented StudentBatch, which
+        uses far less memory than a list of Student objects.
+        """
+        return StudentBatch.from_students(FileManager.iter_students(filename, workers))
+
+    @staticmethod
+    def _split_ranges(filename: str, metadata: dict, parts: int):
+        """
+        Splits the records of a file into about `parts` byte ranges.
+        Every range starts at the beginning of a record: FIXED and BINARY
+        boundaries are multiples of the record stride, DELIMITED ones are
+        moved forward to the next newline.
+        """
+        with open(filename, 'rb') as f:
+            header = f.readline()
+            data_start = len(header)
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+
+            bounds = [data_start]
+            if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+                _, stride = FileManager._slot_layout(header, metadata)
+                slots = -(-(size - data_start) // stride)
+                per_part = max(1, -(-slots // parts))
+                for i in range(1, parts):
+                    bounds.append(min(size, data_start + i * per_part * stride))
+            else:
+                for i in range(1, parts):
+                    guess = data_start + (size - data_start) * i // parts
+                    f.seek(guess - 1)
+                    f.readline()
+                    bounds.append(max(bounds[-1], min(size, f.tell())))
+            bounds.append(size)
+
+        return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    @staticmethod
+    def _parse_range(filename: str, metadata: dict, start: int, end: int):
+        """
+        Worker for parallel loads: parses the records starting inside [start, end).
+        Returns plain (id, name, gpa, dept) tuples, which are cheaper than
+        Student objects to send back between processes.
+        """
+        rows = []
+        if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+            with open(filename, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    _, stride = FileManager._slot_layout(mm, metadata)
+                    students = FileManager._decode_slots(mm[start:end], stride, metadata)
+                    rows = [(s.id, s.name, s.gpa, s.dept) for s in students]
+            return rows
+
+        with open(filename, 'rb') as f:
+            f.seek(start)
+            pos = start
+            while pos < end:
+                raw = f.readline()
+                if not raw:
+                    break
+                pos += len(raw)
+                s = FileManager._parse_line(raw, metadata)
+                if s is not None:
+                    rows.append((s.id, s.name, s.gpa, s.dept))
+        return rows
+
+    @staticmethod
+    def _iter_parallel(filename: str, metadata: dict, workers: int):
+        """
+        Parses newline-aligned ranges of the file in a ProcessPoolExecutor and
+        yields the students in file order. At most 2 * workers ranges are in
+        flight, so memory stays bounded for streaming consumers.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        parts = max(workers, os.path.getsize(filename) // FileManager.PARALLEL_CHUNK_SIZE)
+        ranges = FileManager._split_ranges(filename, metadata, parts)
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(executor.submit(FileManager._parse_range, filename, metadata, start, end))
+                if len(pending) >= 2 * workers:
+                    for row in pending.popleft().result():
+                        yield Student(*row)
+            while pending:
+                for row in pending.popleft().result():
+                    yield Student(*row)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def load_fixed_columns(filename: str):
+        """
+        Loads a FIXED, BINARY or COLUMNAR file as NumPy columns for analytics,
+        without creating one Student per row. Requires numpy.
+        The file is mapped with np.memmap as a structured array whose fields
+        follow Student.FIELD_LENGTHS (with the newline as a padding field), or
+        Student.BINARY_STRUCT for BINARY files. Deleted records are dropped.
+        COLUMNAR segments are read directly into arrays and concatenated.
+        Returns a dict of arrays: 'id' (int64), 'gpa' (float64), and 'name'
+        and 'dept' as space-padded fixed-width bytes.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("numpy is required for columnar loading. Please install it.")
+
         metadata = FileManager.get_file_metadata(filename)
-        file_type = metadata.get('TYPE')
-        delimiter = metadata.get('DELIMITER', '|')
-        
-        students = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            # Skip header
-            f.readline()
-            
-            for line in f:
-                line = line.strip('\n') # Keep spaces for fixed length, just remove newline
-                if not line:
+        if metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+            dtypes = {'id': '<i8', 'gpa': '<f8'}
+            dtypes.update({field: f'S{Student.FIELD_LENGTHS[field]}' for field in ('name', 'dept')})
+            segments = {field: [] for field in ColumnarFormat.COLUMNS}
+            with open(filename, 'rb') as f:
+                for group in ColumnarFormat.iter_groups(f, len(f.readline())):
+                    for field, parts in segments.items():
+                        raw = ColumnarFormat.read_segment(f, group, field)
+                        parts.append(np.frombuffer(raw, dtype=dtypes[field]))
+            return {
+                field: np.concatenate(parts).astype(dtypes[field].lstrip('<'), copy=False)
+                if parts else np.zeros(0, dtype=dtypes[field])
+                for field, parts in segments.items()
+            }
+
+        if metadata.get('TYPE') not in FileManager.SLOT_TYPES:
+            raise ValueError("Columnar loading is only supported for Fixed-Length, Binary and Columnar files.")
+
+        with open(filename, 'rb') as f:
+            header_len, stride = FileManager._slot_layout(f.readline(), metadata)
+            data_size = f.seek(0, os.SEEK_END) - header_len
+            count = FileManager._slot_count(data_size, stride, metadata)
+            # A final FIXED record without its newline can't be mapped as a
+            # whole slot; it is read and padded separately
+            full = data_size // stride
+            tail = b''
+            if count > full:
+                f.seek(header_len + full * stride)
+                tail = f.read().ljust(stride, b'\n')
+
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            l_name, l_dept = Student.FIELD_LENGTHS['name'], Student.FIELD_LENGTHS['dept']
+            dtype = np.dtype([('id', '<u4'), ('gpa', '<f4'), ('name', f'S{l_name}'), ('dept', f'S{l_dept}')])
+            if count <= 0:
+                records = np.zeros(0, dtype=dtype)
+            else:
+                records = np.memmap(filename, dtype=dtype, mode='r', offset=header_len, shape=(count,))
+            records = records[records['id'] != Student.BINARY_DELETED_ID]
+            return {
+                'id': records['id'].astype(np.int64),
+                'name': np.array(records['name']),
+                'gpa': records['gpa'].astype(np.float64).round(2),
+                'dept': np.array(records['dept']),
+            }
+
+        # 'flag' overlaps the first byte of the ID to spot tombstones
+        names = ['flag'] + list(Student.FIELD_LENGTHS) + ['newline']
+        formats = ['u1'] + [f'S{length}' for length in Student.FIELD_LENGTHS.values()]
+        formats.append(f'S{stride - Student.RECORD_LENGTH}')
+        offsets = [0] + [field.start for field in Student.FIELD_SLICES.values()] + [Student.RECORD_LENGTH]
+        dtype = np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': stride})
+
+        if full <= 0:
+            records = np.zeros(0, dtype=dtype)
+        else:
+            records = np.memmap(filename, dtype=dtype, mode='r', offset=header_len, shape=(full,))
+        if tail:
+            records = np.concatenate([records, np.frombuffer(tail, dtype=dtype)])
+        records = records[records['flag'] != FileManager.TOMBSTONE[0]]
+
+        return {
+            'id': records['id'].astype(np.int64),
+            'name': np.array(records['name']),
+            'gpa': records['gpa'].astype(np.float64),
+            'dept': np.array(records['dept']),
+        }
+
+    @staticmethod
+    def _iter_with_offsets(filename: str, metadata: dict):
+        """
+        Yields (byte_offset, Student) for every record in the file.
+        Reads in binary mode so offsets can be used with seek().
+        """
+        if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+            for offset, mm in FileManager._iter_slots(filename, metadata):
+                try:
+                    yield offset, FileManager._decode_slot(mm, offset, metadata)
+                except ValueError:
                     continue
-                    
+            return
+
+        with open(filename, 'rb') as f:
+            offset = len(f.readline())  # Skip header
+
+            for raw in f:
+                line_offset = offset
+                offset += len(raw)
+                student = FileManager._parse_line(raw, metadata)
+                if student is not None:
+                    yield line_offset, student
+
+    @staticmethod
+    def _parse_line(raw: bytes, metadata: dict):
+        """
+        Parses one raw record line (newline included or not), or one packed
+        BINARY record. Returns None for deleted, blank or malformed records.
+        """
+        try:
+            if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+                return FileManager._decode_slot(raw, 0, metadata)
+            if raw.startswith(FileManager.TOMBSTONE):
+                return None
+            line = raw.decode('utf-8').rstrip('\r\n')
+            if not line:
+                return None
+            return FileManager._decode_record(line, metadata)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _record_size(metadata: dict) -> int:
+        """
+        Returns the size in bytes of one FIXED or BINARY record, without newline.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return Student.BINARY_STRUCT.size
+        return Student.RECORD_LENGTH
+
+    @staticmethod
+    def _slot_layout(buf, metadata: dict):
+        """
+        Returns (first_record_offset, record_stride) for a FIXED or BINARY file buffer.
+        FIXED records are followed by the newline size used by the header;
+        BINARY records are packed back to back.
+        """
+        header_len = buf.find(b'\n') + 1
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return header_len, Student.BINARY_STRUCT.size
+        newline_len = 2 if header_len >= 2 and buf[header_len - 2:header_len] == b'\r\n' else 1
+        return header_len, Student.RECORD_LENGTH + newline_len
+
+    @staticmethod
+    def _slot_count(data_size: int, stride: int, metadata: dict) -> int:
+        """
+        Returns the number of FIXED or BINARY record slots in `data_size`
+        bytes after the header. A final FIXED record without its newline
+        still counts.
+        """
+        return max(0, (data_size - FileManager._record_size(metadata)) // stride + 1)
+
+    @staticmethod
+    def _tombstone_marker(metadata: dict) -> bytes:
+        """
+        Returns the bytes written at the start of a deleted record.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return FileManager.BINARY_TOMBSTONE
+        return FileManager.TOMBSTONE
+
+    @staticmethod
+    def _decode_slot(buf, offset: int, metadata: dict) -> Student:
+        """
+        Decodes the FIXED or BINARY record at `offset` in a buffer.
+        Raises ValueError for deleted or malformed records.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return Student.from_binary_bytes(buf, offset)
+        if buf[offset:offset + 1] == FileManager.TOMBSTONE:
+            raise ValueError("Record is deleted.")
+        return Student.from_fixed_bytes(buf, offset)
+
+    @staticmethod
+    def _decode_slots(buf, stride: int, metadata: dict):
+        """
+        Decodes consecutive FIXED or BINARY record slots in one call,
+        skipping deleted and malformed ones.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return Student.decode_binary_batch(buf)
+        return Student.decode_fixed_batch(buf, stride - Student.RECORD_LENGTH)
+
+    @staticmethod
+    def _as_stored(students, data: bytes, stride: int, metadata: dict):
+        """
+        Returns `students` as they read back from `data`, their freshly
+        encoded FIXED or BINARY slots: FIXED keeps only the first digits of
+        a wide ID, GPAs are rounded to 2 places and names and departments
+        lose surrounding spaces. Index keys and stats are computed from
+        these so they match what later reads and removals see. DELIMITED
+        records read back as written.
+        """
+        if metadata.get('TYPE') not in FileManager.SLOT_TYPES:
+            return students
+        stored = FileManager._decode_slots(data, stride, metadata)
+        # A record that doesn't decode is unreachable anyway; keep the input
+        return stored if len(stored) == len(students) else students
+
+    @staticmethod
+    def _iter_slots(filename: str, metadata: dict):
+        """
+        Memory-maps a FIXED or BINARY file and yields (offset, mapping) for
+        every record slot that is not deleted.
+        Callers decode only the fields they need straight from the mapping;
+        the mapping is closed once the generator finishes.
+        """
+        with open(filename, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_len, stride = FileManager._slot_layout(mm, metadata)
+                last_start = len(mm) - FileManager._record_size(metadata)
+                marker = FileManager._tombstone_marker(metadata)
+                for offset in range(header_len, last_start + 1, stride):
+                    if mm[offset:offset + len(marker)] != marker:
+                        yield offset, mm
+
+    @staticmethod
+    def _iter_slot_chunks(filename: str, metadata: dict):
+        """
+        Memory-maps a FIXED or BINARY file and yields (chunk, stride) where
+        each chunk is a bytes copy of up to BATCH_SIZE whole record slots.
+        """
+        with open(filename, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_len, stride = FileManager._slot_layout(mm, metadata)
+                step = FileManager.BATCH_SIZE * stride
+                for start in range(header_len, len(mm), step):
+                    yield mm[start:start + step], stride
+
+    @staticmethod
+    def _iter_slot_batches(filename: str, metadata: dict):
+        """
+        Yields lists of up to BATCH_SIZE students from a FIXED or BINARY
+        file, each decoded in one call.
+        """
+        for chunk, stride in FileManager._iter_slot_chunks(filename, metadata):
+            yield FileManager._decode_slots(chunk, stride, metadata)
+
+    @staticmethod
+    def _read_raw_record(f, metadata: dict) -> bytes:
+        """
+        Reads the raw record at the current position of a binary handle: one
+        packed record for BINARY files, otherwise one line.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            return f.read(Student.BINARY_STRUCT.size)
+        return f.readline()
+
+    @staticmethod
+    def _ensure_index(filename: str, metadata: dict, index: SortedIndex):
+        """
+        Builds an index on first use, or rebuilds it if it went stale.
+        """
+        FileManager._require_uncompressed(filename)
+        FileManager._require_record_offsets(metadata)
+        if index.is_current(filename):
+            return
+
+        if metadata.get('TYPE') == FileManager.TYPE_FIXED:
+            # Only the indexed field has to be decoded
+            entries = []
+            for offset, mm in FileManager._iter_slots(filename, metadata):
                 try:
-                    if file_type == FileManager.TYPE_FIXED:
-                        student = Student.from_fixed_length(line)
-                    else:
-                        student = Student.from_delimited(line, delimiter)
-                    students.append(student)
+                    value = Student.decode_fixed_field(mm, index.field, offset)
                 except ValueError:
-                    # Skip malformed lines or handle error
                     continue
-                    
-        return students
+                entries.append((index.key_func(value), offset))
+        else:
+            entries = [(index.key_of(s), offset) for offset, s in FileManager._iter_with_offsets(filename, metadata)]
+        index.write(filename, entries)
+
+    @staticmethod
+    def _require_uncompressed(filename: str):
+        """
+        Raises ValueError for block-compressed archives, whose records can
+        only be reached through the archive's own block table and ID index.
+        """
+        if FileManager._is_block_archive(filename):
+            raise ValueError("Block-compressed archives only support search and RRN access. "
+                             "Decompress the file first.")
+
+    @staticmethod
+    def _require_record_offsets(metadata: dict):
+        """
+        Raises ValueError for COLUMNAR files, whose records are spread over
+        column segments: they can't be indexed or changed in place.
+        """
+        if metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+            raise ValueError("Columnar files are append-only and have no record offsets. "
+                             "Use query() or convert the file to modify records.")
+
+    @staticmethod
+    def _current_indexes(filename: str):
+        """
+        Returns the indexes that exist and match the data file. Must be called
+        before a mutation: those are the ones to update incrementally, while
+        stale ones are simply rebuilt on next use.
+        """
+        return [index for index in FileManager.INDEXES if index.is_current(filename)]
+
+    @staticmethod
+    def _read_records_at(filename: str, offsets, metadata: dict):
+        """
+        Yields the live records at the given byte offsets, in that order,
+        using a single open handle.
+        """
+        with open(filename, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                student = FileManager._parse_line(FileManager._read_raw_record(f, metadata), metadata)
+                if student is not None:
+                    yield student
+
+    @staticmethod
+    def find_by_dept(filename: str, dept: str):
+        """
+        Returns all students in a department, using the dept index
+        (built on first use). Cost depends on the number of matches.
+        """
+        metadata = FileManager.get_file_metadata(filename)
+        index = FileManager.DEPT_INDEX
+        FileManager._ensure_index(filename, metadata, index)
+
+        key = index.key_func(dept)
+        offsets = []
+        for entry_key, offset in index.iter_from(filename, key):
+            if entry_key != key:
+                break
+            offsets.append(offset)
+
+        # Keys are truncated to the field width, so check the full value
+        return [s for s in FileManager._read_records_at(filename, offsets, metadata) if s.dept == dept]
+
+    @staticmethod
+    def find_by_name_prefix(filename: str, prefix: str, limit: int = None):
+        """
+        Returns students whose name starts with `prefix` (case-insensitive),
+        in name order, using the name index (built on first use).
+        """
+        metadata = FileManager.get_file_metadata(filename)
+        index = FileManager.NAME_INDEX
+        FileManager._ensure_index(filename, metadata, index)
+
+        folded = prefix.casefold()
+        # Cut the prefix like stored keys are cut, never inside a character
+        key_prefix = folded.encode('utf-8')[:Student.FIELD_LENGTHS['name']]
+        key_prefix = key_prefix.decode('utf-8', 'ignore').encode('utf-8')
+
+        def matching_offsets():
+            for entry_key, offset in index.iter_from(filename, key_prefix):
+                if not entry_key.startswith(key_prefix):
+                    return
+                yield offset
+
+        results = []
+        for s in FileManager._read_records_at(filename, matching_offsets(), metadata):
+            if s.name.casefold().startswith(folded):
+                results.append(s)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    @staticmethod
+    def find_by_gpa_range(filename: str, low: float, high: float):
+        """
+        Returns students with low <= GPA <= high in ascending GPA order,
+        using the GPA index (built on first use).
+        """
+        metadata = FileManager.get_file_metadata(filename)
+        index = FileManager.GPA_INDEX
+        FileManager._ensure_index(filename, metadata, index)
+
+        def matching_offsets():
+            for gpa, offset in index.iter_from(filename, float(low)):
+                if gpa > high:
+                    return
+                yield offset
+
+        # Re-check the GPA read, in case an entry outlived its record's value
+        return [s for s in FileManager._read_records_at(filename, matching_offsets(), metadata)
+                if low <= s.gpa <= high]
+
+    @staticmethod
+    def top_by_gpa(filename: str, k: int):
+        """
+        Returns the k students with the highest GPA, best first, by reading
+        the GPA index from its end (built on first use).
+        """
+        metadata = FileManager.get_file_metadata(filename)
+        index = FileManager.GPA_INDEX
+        FileManager._ensure_index(filename, metadata, index)
+
+        results = []
+        if k <= 0:
+            return results
+        keys = []
+
+        def offsets():
+            for gpa, offset in index.iter_reverse(filename):
+                keys.append(gpa)
+                yield offset
+
+        # Offsets are pulled one at a time, so keys[-1] is the key of the
+        # record just read; skip entries whose record no longer has it
+        for s in FileManager._read_records_at(filename, offsets(), metadata):
+            if s.gpa != keys[-1]:
+                continue
+            results.append(s)
+            if len(results) >= k:
+                break
+        return results
+
+    @staticmethod
+    def department_stats(filename: str):
+        """
+        Returns {dept: {'count', 'mean', 'min', 'max'}} of GPA per department.
+        Served from the .stats sidecar, which the mutation methods keep up to
+        date; it is rebuilt by one streaming pass when missing or stale.
+        """
+        if not FileManager.STATS.is_current(filename):
+            depts = {}
+            for s in FileManager.iter_students(filename):
+                DeptStats.accumulate(depts, s)
+            FileManager.STATS.write(filename, depts)
+        else:
+            depts = FileManager.STATS.read(filename)
+
+        return {
+            dept: {'count': count, 'mean': total / count, 'min': low, 'max': high}
+            for dept, (count, total, low, high) in sorted(depts.items())
+        }
+
+    @staticmethod
+    def query(filename: str):
+        """
+        Starts a streaming query over the file, e.g.
+        FileManager.query(filename).where(gpa__gte=3.5, dept="CS").select("id", "name").limit(50)
+        See query.Query.
+        """
+        from query import Query
+        return Query(filename)
+
+    @staticmethod
+    def open(filename: str):
+        """
+        Opens a StudentFile session on the file, which parses the header once
+        and keeps the file open across operations:
+
+            with FileManager.open(filename) as records:
+                records.add(student)
+                records.delete(42)
+
+        See student_file.StudentFile.
+        """
+        from student_file import StudentFile
+        return StudentFile(filename)
 
     @staticmethod
     def search_student(filename: str, student_id: int):
         """
-        Sequentially searches for a student by ID.
+        Searches for a student by ID using the ID index (binary search on disk).
+        The index is built on first use. FIXED and BINARY files sorted by ID
+        (see sort_file) are binary-searched directly instead.
+        On a block-compressed archive only the block holding the record is
+        decompressed. COLUMNAR files are scanned by ID column, skipping row
+        groups whose ID range excludes it.
         Returns (Student, time_taken_ms) or (None, time_taken_ms).
         """
         start_time = time.time()
-        
-        students = FileManager.read_all(filename)
-        for student in students:
-            if student.id == student_id:
-                end_time = time.time()
-                return student, (end_time - start_time) * 1000
-                
+
+        if FileManager._is_block_archive(filename):
+            student = None
+            FileManager._ensure_archive_index(filename)
+            rrn = FileManager.ARCHIVE_ID_INDEX.lookup(filename, student_id)
+            if rrn is not None:
+                student = FileManager._archive_record_at(filename, rrn)
+                if student is not None and student.id != student_id:
+                    student = None
+            return student, (time.time() - start_time) * 1000
+
+        with FileManager.open(filename) as records:
+            student = records.search(student_id)
+
         end_time = time.time()
-        return None, (end_time - start_time) * 1000
+        return student, (end_time - start_time) * 1000
 
     @staticmethod
     def get_record_by_rrn(filename: str, rrn: int):
         """
         Directly accesses a record by Relative Record Number (RRN).
-        Only works for FIXED length files.
+        Only works for FIXED length, BINARY and COLUMNAR files, and for
+        block-compressed archives of any type, where only the block holding
+        the record is decompressed. COLUMNAR files skip whole row groups by
+        their row counts.
         RRN is 0-indexed (0 is the first student record after header).
         """
+        if FileManager._is_block_archive(filename):
+            return FileManager._archive_record_at(filename, rrn)
+
+        # FIXED record length in BYTES is Student.RECORD_LENGTH (39) plus the
+        # newline, whose size (1 or 2 bytes) is detected from the header line.
+        # BINARY records are Student.BINARY_STRUCT.size (38) bytes.
+        with FileManager.open(filename) as records:
+            return records.get(rrn)
+
+    @staticmethod
+    def read_page(filename: str, page: int, page_size: int, sort_by: str = None, descending: bool = False):
+        """
+        Reads one page of records for paged display; the cost depends on the
+        page size, not the file size.
+        Without sort_by, pages follow file order: FIXED and BINARY files are
+        paged by RRN (deleted slots leave their page short) and COLUMNAR
+        files by row position. DELIMITED records have no RRN, so they are
+        paged in ID order. With sort_by (any indexed field), the page is a
+        slice of that field's index, built on first use, read by position;
+        descending reverses the order.
+        Block-compressed archives are paged by RRN, decompressing only the
+        blocks of the page, and can't be sorted.
+        Returns (students, total), where total is the number of slots or
+        records the pages are counted over.
+        """
+        if page < 0 or page_size <= 0:
+            raise ValueError("Page number must be >= 0 and page size > 0.")
+        start = page * page_size
+        if FileManager._is_block_archive(filename):
+            if sort_by is not None:
+                raise ValueError("Sorted paging is not supported for block-compressed archives. "
+                                 "Decompress the file first.")
+            return FileManager._archive_page(filename, start, page_size)
+
         metadata = FileManager.get_file_metadata(filename)
-        if metadata.get('TYPE') != FileManager.TYPE_FIXED:
-            raise ValueError("RRN access is only supported for Fixed-Length files.")
-            
-        # Calculate record length in BYTES
-        # ID(5) + Name(20) + GPA(4) + Dept(10) = 39 bytes.
-        # Plus newline. 
-        # On Windows with 'w' mode, newline is \r\n (2 bytes). On Linux \n (1 byte).
-        # However, we are now using encoding='utf-8'.
-        # If we write with 'w', Python handles newline translation.
-        # To effectively seek, we should open in BINARY mode or know the exact newline char.
-        # Let's assume standard newline behavior for the platform or enforce one.
-        # But we can't easily enforce it without rewriting create_file.
-        # Let's try to detect it from the header line.
-        
-        record_len_bytes = 39
-        
-        with open(filename, 'rb') as f:
-            header_bytes = f.readline()
-            header_offset = len(header_bytes)
-            
-            # Determine newline size from header
-            # If header ends with \r\n, it's 2 bytes.
-            if header_bytes.endswith(b'\r\n'):
-                newline_len = 2
+        if sort_by is None and metadata.get('TYPE') == FileManager.TYPE_DELIMITED:
+            sort_by = 'id'
+
+        if sort_by is not None:
+            index = {index.field: index for index in FileManager.INDEXES}.get(sort_by)
+            if index is None:
+                raise ValueError(f"Unknown sort field: {sort_by}")
+            FileManager._ensure_index(filename, metadata, index)
+            total = index.count(filename)
+            if descending:
+                end = max(total - start, 0)
+                entries = index.entries_at(filename, max(end - page_size, 0), min(page_size, end))[::-1]
             else:
-                newline_len = 1
-                
-            full_record_len = record_len_bytes + newline_len
-            
-            # Calculate target offset
-            target_offset = header_offset + (rrn * full_record_len)
-            
-            f.seek(target_offset)
-            record_bytes = f.readline()
-            
-            if not record_bytes:
-                return None
-                
-            # Check if we got a full record (ignoring potential EOF missing newline)
-            # If it's the last record, it might not have a newline if manually edited, 
-            # but our app writes newlines.
-            # Let's just check if we got at least record_len_bytes
-            if len(record_bytes) < record_len_bytes:
-                 return None
-
-            try:
-                line = record_bytes.decode('utf-8').strip('\r\n')
-                return Student.from_fixed_length(line)
-            except Exception:
-                return None
+                entries = index.entries_at(filename, start, page_size)
+            offsets = [offset for _, offset in entries]
+            return list(FileManager._read_records_at(filename, offsets, metadata)), total
+
+        if metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+            students = []
+            total = 0
+            with open(filename, 'rb') as f:
+                for group in ColumnarFormat.iter_groups(f, len(f.readline())):
+                    # Only groups overlapping the page are read; the rest
+                    # just add their row counts
+                    if total + group.rows > start and len(students) < page_size:
+                        rows = ColumnarFormat.read_students(f, group)[max(start - total, 0):]
+                        students.extend(rows[:page_size - len(students)])
+                    total += group.rows
+            return students, total
+
+        with open(filename, 'rb') as f:
+            header_len, stride = FileManager._slot_layout(f.readline(), metadata)
+            total = FileManager._slot_count(os.path.getsize(filename) - header_len, stride, metadata)
+            f.seek(header_len + start * stride)
+            buf = f.read(page_size * stride)
+        return FileManager._decode_slots(buf, stride, metadata), total
 
     @staticmethod
     def _create_header_string(metadata: dict) -> str:
@@ -193,118 +1042,277 @@ class FileManager:
         """
         file_type = metadata.get('TYPE')
         date_str = metadata.get('DATE')
+        # Sorted files carry the sort key, e.g. SORTED=ID
+        sorted_str = f"SORTED={metadata['SORTED']}," if 'SORTED' in metadata else ""
         
-        if file_type == FileManager.TYPE_FIXED:
-            return f"{FileManager.HEADER_PREFIX}TYPE={file_type},DATE={date_str},FIELDS=ID|Name|GPA|Dept"
+        if file_type != FileManager.TYPE_DELIMITED:
+            return f"{FileManager.HEADER_PREFIX}TYPE={file_type},DATE={date_str},{sorted_str}FIELDS=ID|Name|GPA|Dept"
         else:
             delimiter = metadata.get('DELIMITER', '|')
-            return f"{FileManager.HEADER_PREFIX}TYPE={file_type},DELIMITER={delimiter},DATE={date_str},FIELDS=ID|Name|GPA|Dept"
+            return f"{FileManager.HEADER_PREFIX}TYPE={file_type},DELIMITER={delimiter},DATE={date_str},{sorted_str}FIELDS=ID|Name|GPA|Dept"
+
+    @staticmethod
+    def _rewrite(filename: str, metadata: dict, students):
+        """
+        Rewrites the whole file from an iterable of students.
+        The iterable may stream from the file itself: records go to a temporary
+        file which then replaces the original.
+        Indexes that existed are rebuilt from the offsets written.
+        COLUMNAR files are rewritten as row groups of BATCH_SIZE records.
+        """
+        indexes = [index for index in FileManager.INDEXES if os.path.exists(index.path(filename))]
+        had_stats = os.path.exists(FileManager.STATS.path(filename))
+        depts = {}
+        newline = FileManager._newline(filename)
+        terminator = FileManager._record_terminator(filename, metadata)
+        header = FileManager._create_header_string(metadata)
+        temp_filename = filename + ".tmp"
+
+        entries = {index: [] for index in indexes}
+        with open(temp_filename, 'wb') as f_write:
+            offset = f_write.write(header.encode('utf-8') + newline)
+            if metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+                # Never indexed, so there are no offsets to collect
+                for batch in FileManager._batches(students, FileManager.BATCH_SIZE):
+                    if had_stats:
+                        for s in batch:
+                            DeptStats.accumulate(depts, s)
+                    f_write.write(ColumnarFormat.encode(batch))
+                students = ()
+            for s in students:
+                for index, index_entries in entries.items():
+                    index_entries.append((index.key_of(s), offset))
+                if had_stats:
+                    DeptStats.accumulate(depts, s)
+                offset += f_write.write(FileManager._encode_record(s, metadata) + terminator)
+        os.replace(temp_filename, filename)
+
+        for index, index_entries in entries.items():
+            index.write(filename, index_entries)
+        if had_stats:
+            FileManager.STATS.write(filename, depts)
+        FileManager._notify(filename, 'reset', [])
 
     @staticmethod
     def delete_student(filename: str, student_id: int):
         """
         Deletes a student by ID.
+        Records are tombstoned in place rather than rewriting the file; the
+        space is reclaimed by compact(), which runs automatically once
+        COMPACT_RATIO of the slots are dead.
+        """
+        with FileManager.open(filename) as records:
+            return records.delete(student_id)
+
+    @staticmethod
+    def _needs_compaction(filename: str) -> bool:
+        dead = FileManager.AVAIL_LIST.count(filename)
+        live = FileManager.ID_INDEX.count(filename)
+        return dead > 0 and dead >= FileManager.COMPACT_RATIO * (live + dead)
+
+    @staticmethod
+    def compact(filename: str):
+        """
+        Rewrites the file without its deleted records in one streaming pass
+        and clears the avail list.
         """
-        students = FileManager.read_all(filename)
         metadata = FileManager.get_file_metadata(filename)
-        file_type = metadata.get('TYPE')
-        delimiter = metadata.get('DELIMITER', '|')
+        FileManager._rewrite(filename, metadata, FileManager.iter_students(filename))
+        FileManager.AVAIL_LIST.remove_file(filename)
+
+    @staticmethod
+    def sort_file(filename: str, key: str = "id", progress=None):
+        """
+        Sorts the records of the file by a Student field with an external
+        merge sort, so files larger than memory can be sorted: runs of
+        SORT_RUN_RECORDS records are sorted in memory and written to
+        temporary files of the same type, then merged in streaming passes of
+        at most SORT_MERGE_FAN_IN runs each.
+        Deleted records are dropped and the header is marked SORTED=<KEY>,
+        which lets search_student binary-search FIXED and BINARY files
+        sorted by ID. The mark is cleared by any later add or update.
+        If given, progress(count) is called after each run is written with
+        the number of records sorted into runs so far.
+        """
+        import heapq
         
-        found = False
-        new_students = []
-        for s in students:
-            if s.id == student_id:
-                found = True
-                continue
-            new_students.append(s)
+        if key not in Student.FIELD_LENGTHS:
+            raise ValueError(f"Unknown sort key: {key}")
+        metadata = FileManager.get_file_metadata(filename)
+        sort_key = lambda s: getattr(s, key)
+        
+        created = []
+        
+        def write_run(students):
+            run = f"{filename}.run{len(created)}"
+            created.append(run)
+            FileManager.create_file(run, metadata.get('TYPE'), metadata.get('DELIMITER', '|'))
+            FileManager.add_students(run, students)
+            return run
+        
+        def merge(runs):
+            return heapq.merge(*(FileManager._iter_run(run) for run in runs), key=sort_key)
+        
+        runs = []
+        count = 0
+        try:
+            for batch in FileManager._batches(FileManager.iter_students(filename), FileManager.SORT_RUN_RECORDS):
+                runs.append(write_run(sorted(batch, key=sort_key)))
+                count += len(batch)
+                if progress is not None:
+                    progress(count)
             
-        if found:
-            header = FileManager._create_header_string(metadata)
-                
-            with open(filename, 'w', encoding='utf-8') as f_write:
-                f_write.write(header + "\n")
-                for s in new_students:
-                    if file_type == FileManager.TYPE_FIXED:
-                        f_write.write(s.to_fixed_length() + "\n")
-                    else:
-                        f_write.write(s.to_delimited(delimiter) + "\n")
-            return True
-        return False
+            fan_in = FileManager.SORT_MERGE_FAN_IN
+            while len(runs) > fan_in:
+                merged_runs = []
+                for start in range(0, len(runs), fan_in):
+                    group = runs[start:start + fan_in]
+                    merged_runs.append(write_run(merge(group)))
+                    for run in group:
+                        os.remove(run)
+                runs = merged_runs
+            
+            metadata['SORTED'] = key.upper()
+            FileManager._rewrite(filename, metadata, merge(runs))
+        finally:
+            for run in created:
+                if os.path.exists(run):
+                    os.remove(run)
+        FileManager.AVAIL_LIST.remove_file(filename)
+
+    @staticmethod
+    def _iter_run(filename: str):
+        """
+        Yields the records of a sort run in file order through one buffered
+        handle, so a merge holds a single descriptor per run.
+        """
+        with open(filename, 'rb') as f:
+            header = f.readline()
+            metadata = FileManager._parse_header(header.decode('utf-8').strip())
+            if metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+                for group in ColumnarFormat.iter_groups(f, len(header)):
+                    yield from ColumnarFormat.read_students(f, group)
+            elif metadata.get('TYPE') in FileManager.SLOT_TYPES:
+                stride = FileManager._slot_layout(header, metadata)[1]
+                while True:
+                    chunk = f.read(FileManager.BATCH_SIZE * stride)
+                    if not chunk:
+                        return
+                    yield from FileManager._decode_slots(chunk, stride, metadata)
+            else:
+                for raw in f:
+                    student = FileManager._parse_line(raw, metadata)
+                    if student is not None:
+                        yield student
+
+    @staticmethod
+    def _sorted_by(metadata: dict):
+        """
+        Returns the field the file is sorted by, or None.
+        """
+        key = metadata.get('SORTED', '').strip().lower()
+        return key if key in Student.FIELD_LENGTHS else None
+
+    @staticmethod
+    def _clear_sorted(filename: str, metadata: dict):
+        """
+        Drops the SORTED mark before a change that may break the order. The
+        header is patched in place with a same-length SORTED=NO value.
+        """
+        if FileManager._sorted_by(metadata) is None:
+            return
+        with open(filename, 'r+b') as f:
+            header = f.readline()
+            start = header.find(b',SORTED=') + len(b',SORTED=')
+            end = header.find(b',', start)
+            f.seek(start)
+            f.write(b'NO'.ljust(end - start))
+        metadata['SORTED'] = 'NO'
 
     @staticmethod
     def update_student(filename: str, student_id: int, new_student_data: Student):
         """
         Updates a student record.
+        FIXED and BINARY files are patched in place at the record's offset
+        (found via the ID index). Delimited records vary in length, so the old
+        one is tombstoned and the new one appended.
         """
-        students = FileManager.read_all(filename)
-        metadata = FileManager.get_file_metadata(filename)
-        file_type = metadata.get('TYPE')
-        delimiter = metadata.get('DELIMITER', '|')
-        
-        found = False
-        for i, s in enumerate(students):
-            if s.id == student_id:
-                students[i] = new_student_data
-                found = True
-                break
-        
-        if found:
-            header = FileManager._create_header_string(metadata)
-            with open(filename, 'w', encoding='utf-8') as f_write:
-                f_write.write(header + "\n")
-                for s in students:
-                    if file_type == FileManager.TYPE_FIXED:
-                        f_write.write(s.to_fixed_length() + "\n")
-                    else:
-                        f_write.write(s.to_delimited(delimiter) + "\n")
-            return True
-        return False
-                
+        with FileManager.open(filename) as records:
+            return records.update(student_id, new_student_data)
+
+    @staticmethod
+    def update_record_by_rrn(filename: str, rrn: int, new_student_data: Student):
+        """
+        Overwrites the record at a Relative Record Number in place.
+        Only works for FIXED length and BINARY files (COLUMNAR files can't be
+        changed in place). Returns False if the RRN is out of range.
+        """
+        with FileManager.open(filename) as records:
+            return records.update_at(rrn, new_student_data)
+
     @staticmethod
-    def export_to_csv(filename: str, output_path: str):
+    def export_to_csv(filename: str, output_path: str, workers: int = 1, progress=None):
         """
         Exports all students from the given file to a CSV file.
+        Records stream straight from the data file and are written with one
+        writerows call per batch of BATCH_SIZE, so memory stays flat.
+        With workers > 1, parsing is spread over several processes.
+        If given, progress(count) is called after each batch with the number
+        of records exported so far.
         """
         import csv
-        students = FileManager.read_all(filename)
         
         with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
             writer = csv.writer(csvfile)
             # Write header
             writer.writerow(['ID', 'Name', 'GPA', 'Department'])
             # Write data
-            for s in students:
-                writer.writerow([s.id, s.name, s.gpa, s.dept])
+            count = 0
+            for batch in FileManager._batches(FileManager.iter_students(filename, workers), FileManager.BATCH_SIZE):
+                writer.writerows([s.id, s.name, s.gpa, s.dept] for s in batch)
+                count += len(batch)
+                if progress is not None:
+                    progress(count)
                 
     @staticmethod
-    def export_to_excel(filename: str, output_path: str):
+    def export_to_excel(filename: str, output_path: str, progress=None):
         """
         Exports all students from the given file to an Excel file.
-        Requires pandas and openpyxl.
+        Requires openpyxl. Rows stream from the data file into a write-only
+        workbook, so memory stays flat however large the file is.
+        If given, progress(count) is called after each batch of BATCH_SIZE
+        records with the number of records exported so far.
         """
         try:
-            import pandas as pd
+            from openpyxl import Workbook
         except ImportError:
-            raise ImportError("pandas is required for Excel export. Please install it.")
+            raise ImportError("openpyxl is required for Excel export. Please install it.")
             
-        students = FileManager.read_all(filename)
-        
-        data = []
-        for s in students:
-            data.append({
-                'ID': s.id,
-                'Name': s.name,
-                'GPA': s.gpa,
-                'Department': s.dept
-            })
-            
-        df = pd.DataFrame(data)
-        df.to_excel(output_path, index=False)
+        header = ['ID', 'Name', 'GPA', 'Department']
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_rows = FileManager.EXCEL_MAX_ROWS
+        count = 0
+        for batch in FileManager._batches(FileManager.iter_students(filename), FileManager.BATCH_SIZE):
+            for s in batch:
+                if sheet_rows >= FileManager.EXCEL_MAX_ROWS:
+                    sheet = workbook.create_sheet(f"Sheet{len(workbook.worksheets) + 1}")
+                    sheet.append(header)
+                    sheet_rows = 1
+                sheet.append([s.id, s.name, s.gpa, s.dept])
+                sheet_rows += 1
+            count += len(batch)
+            if progress is not None:
+                progress(count)
+        if sheet is None:
+            workbook.create_sheet("Sheet1").append(header)
+        workbook.save(output_path)
 
     @staticmethod
-    def import_from_csv(csv_path: str, target_filename: str, target_type: str):
+    def import_from_csv(csv_path: str, target_filename: str, target_type: str, progress=None):
         """
         Imports students from a CSV file into a new data file.
+        progress is passed on to add_students.
         """
         import csv
         
@@ -313,11 +1321,7 @@ class FileManager:
             
         FileManager.create_file(target_filename, target_type)
         
-        with open(csv_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            # Check if header exists and matches expected fields roughly
-            # We assume CSV has headers: ID, Name, GPA, Department (or Dept)
-            
+        def parse_rows(reader):
             for row in reader:
                 # Map CSV columns to Student fields
                 # Try to be flexible with column names
@@ -328,67 +1332,392 @@ class FileManager:
                 
                 if s_id and s_name:
                     try:
-                        student = Student(int(s_id), s_name, float(s_gpa), s_dept)
-                        FileManager.add_student(target_filename, student)
+                        yield Student(int(s_id), s_name, float(s_gpa), s_dept)
                     except ValueError:
                         continue # Skip invalid rows
 
+        with open(csv_path, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            # Check if header exists and matches expected fields roughly
+            # We assume CSV has headers: ID, Name, GPA, Department (or Dept)
+            
+            # Single pass: rows are parsed lazily and appended in bulk
+            FileManager.add_students(target_filename, parse_rows(reader), progress)
+
     @staticmethod
-    def convert_file_structure(filename: str, new_type: str):
+    def convert_file_structure(filename: str, new_type: str, delimiter: str = "|", workers: int = 1, progress=None):
         """
-        Converts the file to a different structure type (Fixed <-> Delimited).
+        Converts the file to a different structure type (Fixed, Delimited,
+        Binary or Columnar).
+        Works in one streaming pass with constant memory: the source is read
+        in batches (by `workers` processes for large files), encoded in
+        batches and written through a single handle by add_students, so any
+        type add_students can encode is a valid target. The output is built
+        in a temporary file and only replaces an earlier conversion once it
+        is complete. progress is passed on to add_students.
         Returns the new filename.
         """
-        students = FileManager.read_all(filename)
+        if new_type not in FileManager.FILE_TYPES:
+            raise ValueError(f"Unknown file type: {new_type}")
         
         # Create new filename
         base, ext = os.path.splitext(filename)
         new_filename = f"{base}_converted{ext}"
+        temp_filename = new_filename + ".tmp"
         
-        if os.path.exists(new_filename):
-            os.remove(new_filename)
-            
-        FileManager.create_file(new_filename, new_type)
-        
-        for s in students:
-            FileManager.add_student(new_filename, s)
+        try:
+            FileManager.create_file(temp_filename, new_type, delimiter)
+            FileManager.add_students(temp_filename, FileManager.iter_students(filename, workers), progress)
+            os.replace(temp_filename, new_filename)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+        FileManager._remove_sidecars(new_filename)
+        FileManager._notify(new_filename, 'reset', [])
             
         return new_filename
 
     @staticmethod
-    def compress_file(filename: str):
+    def compress_file(filename: str, level: int = 9, workers: int = 1, progress=None):
         """
         Compresses the file using gzip.
+        The input is compressed in GZIP_CHUNK_SIZE chunks, each written as its
+        own gzip member; with workers > 1 the chunks are compressed by a
+        thread pool. The output is a standard gzip file either way.
+        If given, progress(count) is called after each member is written with
+        the number of input bytes read so far.
         Returns the compressed filename.
         """
-        import gzip
-        import shutil
-        
         compressed_filename = f"{filename}.gz"
         
         with open(filename, 'rb') as f_in:
-            with gzip.open(compressed_filename, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+            with open(compressed_filename, 'wb') as f_out:
+                chunks = iter(lambda: f_in.read(FileManager.GZIP_CHUNK_SIZE), b'')
+                written = False
+                for member in FileManager._compress_members(chunks, level, workers):
+                    f_out.write(member)
+                    written = True
+                    if progress is not None:
+                        progress(f_in.tell())
+                if not written:
+                    # An empty file still needs one (empty) member
+                    f_out.write(FileManager._gzip_member(b'', level))
+        
+        # A single stream can't be accessed by block
+        FileManager.BLOCK_INDEX.remove_file(compressed_filename)
+        FileManager.ARCHIVE_ID_INDEX.remove_file(compressed_filename)
                 
         return compressed_filename
 
     @staticmethod
-    def decompress_file(filename: str):
+    def compress_file_blocks(filename: str, block_records: int = None, level: int = 9, workers: int = 1,
+                             progress=None):
+        """
+        Compresses the file into a block-compressed gzip archive: the header
+        and then every `block_records` records (BLOCK_RECORDS by default) are
+        separate gzip members, so the archive still decompresses with
+        decompress_file or gunzip. The block offsets and an ID -> RRN index
+        are stored next to it, which lets get_record_by_rrn and
+        search_student read the archive without decompressing it.
+        With workers > 1 the blocks are compressed by a thread pool.
+        progress is called like in compress_file.
+        Returns the compressed filename.
+        """
+        metadata = FileManager.get_file_metadata(filename)
+        FileManager._require_record_offsets(metadata)
+        block_records = block_records or FileManager.BLOCK_RECORDS
+        if block_records <= 0:
+            raise ValueError("Block size must be a positive number of records.")
+        compressed_filename = f"{filename}.gz"
+        
+        offsets = []
+        entries = []
+        with open(filename, 'rb') as f_in, open(compressed_filename, 'wb') as f_out:
+            header = f_in.readline()
+
+            def members():
+                # Indexes the records of each block as it goes to the pool
+                rrn = 0
+                yield header
+                for block in FileManager._iter_raw_blocks(f_in, header, metadata, block_records):
+                    for raw in FileManager._split_block(block, header, metadata):
+                        student = FileManager._parse_line(raw, metadata)
+                        if student is not None:
+                            entries.append((student.id, rrn))
+                        rrn += 1
+                    yield block
+
+            for member in FileManager._compress_members(members(), level, workers):
+                offsets.append(f_out.tell())
+                f_out.write(member)
+                if progress is not None:
+                    progress(f_in.tell())
+            offsets.append(f_out.tell())
+        
+        # The first member is the header; the table starts at block 0
+        FileManager.BLOCK_INDEX.write(compressed_filename, block_records, offsets[1:])
+        FileManager.ARCHIVE_ID_INDEX.write(compressed_filename, entries)
+        return compressed_filename
+
+    @staticmethod
+    def decompress_file(filename: str, workers: int = 1, progress=None):
         """
         Decompresses a gzip file.
+        With workers > 1, files written by compress_file are inflated member
+        by member in a thread pool; other gzip files are decompressed as a
+        single stream.
+        If given, progress(count) is called after each chunk is written with
+        the number of bytes decompressed so far.
         Returns the decompressed filename (removes .gz).
         """
         import gzip
-        import shutil
         
         if not filename.endswith('.gz'):
             raise ValueError("File must end with .gz")
             
         decompressed_filename = filename[:-3]
         
+        spans = FileManager._gzip_member_spans(filename) if workers > 1 else None
+        if spans is not None:
+            import zlib
+            with open(filename, 'rb') as f_in, open(decompressed_filename, 'wb') as f_out:
+                def members():
+                    for start, end in spans:
+                        f_in.seek(start)
+                        yield f_in.read(end - start)
+
+                # wbits=31 expects one gzip member and checks its CRC
+                inflate = lambda member: zlib.decompress(member, 31)
+                for data in FileManager._map_ordered(inflate, members(), workers):
+                    f_out.write(data)
+                    if progress is not None:
+                        progress(f_out.tell())
+            FileManager._notify(decompressed_filename, 'reset', [])
+            return decompressed_filename
+        
         with gzip.open(filename, 'rb') as f_in:
             with open(decompressed_filename, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
-                
+                for data in iter(lambda: f_in.read(FileManager.GZIP_CHUNK_SIZE), b''):
+                    f_out.write(data)
+                    if progress is not None:
+                        progress(f_out.tell())
+        FileManager._notify(decompressed_filename, 'reset', [])
         return decompressed_filename
 
+    @staticmethod
+    def _gzip_member(data: bytes, level: int) -> bytes:
+        """
+        Compresses `data` into one complete gzip member whose FEXTRA field
+        holds the member's total size under GZIP_SIZE_FIELD.
+        """
+        import struct
+        import zlib
+        
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        body = compressor.compress(data) + compressor.flush()
+        # magic, deflate, FEXTRA flag, mtime 0, XFL, OS unknown, XLEN
+        # then the subfield: id, length 8, uint64 member size
+        header_size = 10 + 2 + 4 + 8
+        trailer = struct.pack('<II', zlib.crc32(data), len(data) & 0xFFFFFFFF)
+        xfl = 2 if level == 9 else 4 if level == 1 else 0
+        header = struct.pack('<BBBBIBBH2sHQ', 0x1f, 0x8b, 8, 4, 0, xfl, 255, 12,
+                             FileManager.GZIP_SIZE_FIELD, 8, header_size + len(body) + len(trailer))
+        return header + body + trailer
+
+    @staticmethod
+    def _gzip_member_spans(filename: str):
+        """
+        Returns the (start, end) byte range of every gzip member in the file,
+        read from their GZIP_SIZE_FIELD subfields, or None if any member
+        lacks one (the file was not written by compress_file).
+        """
+        import struct
+        
+        spans = []
+        size = os.path.getsize(filename)
+        with open(filename, 'rb') as f:
+            start = 0
+            while start < size:
+                f.seek(start)
+                fixed = f.read(12)
+                if len(fixed) < 12 or fixed[:3] != b'\x1f\x8b\x08' or not fixed[3] & 4:
+                    return None
+                (xlen,) = struct.unpack('<H', fixed[10:12])
+                extra = f.read(xlen)
+
+                member_size = None
+                pos = 0
+                while pos + 4 <= len(extra):
+                    field_id = extra[pos:pos + 2]
+                    (field_len,) = struct.unpack('<H', extra[pos + 2:pos + 4])
+                    if field_id == FileManager.GZIP_SIZE_FIELD and field_len == 8:
+                        (member_size,) = struct.unpack('<Q', extra[pos + 4:pos + 12])
+                    pos += 4 + field_len
+                if member_size is None or member_size < 12 + xlen or start + member_size > size:
+                    return None
+                spans.append((start, start + member_size))
+                start += member_size
+        return spans
+
+    @staticmethod
+    def _compress_members(chunks, level: int, workers: int):
+        """
+        Yields one gzip member per chunk of bytes, in order.
+        """
+        compress = lambda chunk: FileManager._gzip_member(chunk, level)
+        if workers <= 1:
+            return map(compress, chunks)
+        return FileManager._map_ordered(compress, chunks, workers)
+
+    @staticmethod
+    def _map_ordered(func, items, workers: int):
+        """
+        Applies func to items in a thread pool and yields the results in
+        order. zlib releases the GIL, so compression runs on several cores.
+        At most 2 * workers items are in flight, which bounds memory.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _is_block_archive(filename: str) -> bool:
+        """
+        True if the file is a block-compressed archive with a current block table.
+        """
+        return filename.endswith('.gz') and FileManager.BLOCK_INDEX.is_current(filename)
+
+    @staticmethod
+    def _iter_raw_blocks(f, header: bytes, metadata: dict, block_records: int):
+        """
+        Yields the raw bytes of consecutive blocks of `block_records` records
+        from a binary handle positioned after the header.
+        """
+        if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+            _, stride = FileManager._slot_layout(header, metadata)
+            while True:
+                block = f.read(stride * block_records)
+                if not block:
+                    return
+                yield block
+        else:
+            import itertools
+            while True:
+                lines = list(itertools.islice(f, block_records))
+                if not lines:
+                    return
+                yield b''.join(lines)
+
+    @staticmethod
+    def _split_block(block: bytes, header: bytes, metadata: dict):
+        """
+        Splits a decompressed block into its raw records, one per RRN.
+        """
+        if metadata.get('TYPE') in FileManager.SLOT_TYPES:
+            _, stride = FileManager._slot_layout(header, metadata)
+            last_start = len(block) - FileManager._record_size(metadata)
+            return [block[start:start + stride] for start in range(0, last_start + 1, stride)]
+        import io
+        return io.BytesIO(block).readlines()
+
+    @staticmethod
+    def _read_member(filename: str, start: int, end: int) -> bytes:
+        """
+        Reads and decompresses the gzip member at [start, end) of an archive.
+        """
+        import gzip
+        with open(filename, 'rb') as f:
+            f.seek(start)
+            return gzip.decompress(f.read(end - start))
+
+    @staticmethod
+    def _archive_header(filename: str) -> bytes:
+        """
+        Returns the header line (newline included) of a block-compressed archive.
+        """
+        _, offsets = FileManager.BLOCK_INDEX.read(filename)
+        return FileManager._read_member(filename, 0, offsets[0])
+
+    @staticmethod
+    def _archive_record_at(filename: str, rrn: int):
+        """
+        Decompresses the one block of an archive that holds an RRN and parses
+        that record. Returns None if the RRN is out of range or deleted.
+        """
+        block_records, offsets = FileManager.BLOCK_INDEX.read(filename)
+        block_no, position = divmod(rrn, block_records)
+        if rrn < 0 or block_no >= len(offsets) - 1:
+            return None
+        
+        header = FileManager._read_member(filename, 0, offsets[0])
+        metadata = FileManager._parse_header(header.decode('utf-8').strip())
+        block = FileManager._read_member(filename, offsets[block_no], offsets[block_no + 1])
+        records = FileManager._split_block(block, header, metadata)
+        if position >= len(records):
+            return None
+        return FileManager._parse_line(records[position], metadata)
+
+    @staticmethod
+    def _archive_page(filename: str, start: int, count: int):
+        """
+        Reads the records at RRNs [start, start + count) of an archive,
+        decompressing only the blocks they fall in. Returns (students, total
+        number of RRNs); the last block is read to count its records.
+        """
+        block_records, offsets = FileManager.BLOCK_INDEX.read(filename)
+        blocks = len(offsets) - 1
+        if blocks <= 0:
+            return [], 0
+
+        header = FileManager._read_member(filename, 0, offsets[0])
+        metadata = FileManager._parse_header(header.decode('utf-8').strip())
+
+        def block_at(block_no):
+            block = FileManager._read_member(filename, offsets[block_no], offsets[block_no + 1])
+            return FileManager._split_block(block, header, metadata)
+
+        last = block_at(blocks - 1)
+        total = (blocks - 1) * block_records + len(last)
+
+        students = []
+        end = min(start + count, total)
+        for block_no in range(start // block_records, -(-end // block_records)):
+            records = last if block_no == blocks - 1 else block_at(block_no)
+            first = block_no * block_records
+            for raw in records[max(start - first, 0):end - first]:
+                student = FileManager._parse_line(raw, metadata)
+                if student is not None:
+                    students.append(student)
+        return students, total
+
+    @staticmethod
+    def _ensure_archive_index(filename: str):
+        """
+        Rebuilds the ID -> RRN index of an archive by streaming its blocks,
+        if it is missing or stale.
+        """
+        if FileManager.ARCHIVE_ID_INDEX.is_current(filename):
+            return
+        
+        block_records, offsets = FileManager.BLOCK_INDEX.read(filename)
+        header = FileManager._read_member(filename, 0, offsets[0])
+        metadata = FileManager._parse_header(header.decode('utf-8').strip())
+        entries = []
+        for block_no, (start, end) in enumerate(zip(offsets, offsets[1:])):
+            block = FileManager._read_member(filename, start, end)
+            for position, raw in enumerate(FileManager._split_block(block, header, metadata)):
+                student = FileManager._parse_line(raw, metadata)
+                if student is not None:
+                    entries.append((student.id, block_no * block_records + position))
+        FileManager.ARCHIVE_ID_INDEX.write(filename, entries)
+
@@ -0,0 +1,312 @@
+import operator
+
+from student import Student
+from file_manager import FileManager
+from columnar import ColumnarFormat
+
+
+class Query:
+    """
+    A small streaming query over a student data file.
+
+    Example:
+        FileManager.query("students.txt").where(gpa__gte=3.5, dept="CS").select("id", "name").limit(50)
+
+    Conditions are given as field=value or field__op=value. Records are
+    filtered as the file is scanned: for FIXED files only the fields used by
+    the conditions are decoded (string equality is checked on the raw bytes),
+    and only the selected fields are decoded for matching rows. BINARY
+    chunks are unpacked with one struct call and filtered the same way.
+    COLUMNAR files skip row groups whose zone maps rule out a condition and
+    read only the column segments of the condition fields, then the
+    selected fields of groups with matches. limit() stops the scan early.
+    When a current ID, dept, GPA or name index exists, it is used to find
+    candidate records instead of scanning.
+
+    Iterating yields dicts of the selected fields, or Student objects when
+    select() was not called. Index-driven results come in index order.
+    """
+
+    FIELDS = ('id', 'name', 'gpa', 'dept')
+
+    OPERATORS = {
+        'eq': operator.eq,
+        'ne': operator.ne,
+        'lt': operator.lt,
+        'lte': operator.le,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'in': lambda value, options: value in options,
+        'startswith': lambda value, prefix: value.startswith(prefix),
+    }
+
+    # Field position in a delimited record and its parser
+    DELIMITED_COLUMNS = {'id': (0, int), 'name': (1, str), 'gpa': (2, float), 'dept': (3, str)}
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.conditions = []  # (field, operator name, value)
+        self.fields = None
+        self.max_rows = None
+
+    def where(self, **conditions):
+        for key, value in conditions.items():
+            field, _, op = key.partition('__')
+            op = op or 'eq'
+            if field not in self.FIELDS:
+                raise ValueError(f"Unknown field: {field}")
+            if op not in self.OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            self.conditions.append((field, op, value))
+        return self
+
+    def select(self, *fields):
+        for field in fields:
+            if field not in self.FIELDS:
+                raise ValueError(f"Unknown field: {field}")
+        self.fields = fields
+        return self
+
+    def limit(self, count: int):
+        self.max_rows = count
+        return self
+
+    def all(self):
+        return list(self)
+
+    def __iter__(self):
+        if self.max_rows is not None and self.max_rows <= 0:
+            return
+        metadata = FileManager.get_file_metadata(self.filename)
+        _, offsets = self._plan()
+
+        if offsets is not None:
+            rows = self._from_offsets(offsets, metadata)
+        elif metadata.get('TYPE') == FileManager.TYPE_FIXED:
+            rows = self._scan_fixed(metadata)
+        elif metadata.get('TYPE') == FileManager.TYPE_BINARY:
+            rows = self._scan_binary(metadata)
+        elif metadata.get('TYPE') == FileManager.TYPE_COLUMNAR:
+            rows = self._scan_columnar()
+        else:
+            rows = self._scan_delimited(metadata)
+
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if self.max_rows is not None and count >= self.max_rows:
+                return
+
+    def explain(self) -> str:
+        """
+        Describes how the query will run: 'scan' or 'index:<field>'.
+        """
+        return self._plan()[0]
+
+    # --- Planning ---
+
+    def _plan(self):
+        """
+        Picks an index that can narrow the candidates, if one is current.
+        Returns (description, offsets iterator or None for a full scan).
+        """
+        filename = self.filename
+        FileManager._require_uncompressed(filename)
+        for field, op, value in self.conditions:
+            if field == 'id' and op == 'eq' and FileManager.ID_INDEX.is_current(filename):
+                return 'index:id', self._equal_offsets(FileManager.ID_INDEX, value)
+        for field, op, value in self.conditions:
+            if field == 'dept' and op == 'eq' and FileManager.DEPT_INDEX.is_current(filename):
+                index = FileManager.DEPT_INDEX
+                return 'index:dept', self._equal_offsets(index, index.key_func(value))
+
+        low, high = self._gpa_bounds()
+        if (low, high) != (None, None) and FileManager.GPA_INDEX.is_current(filename):
+            return 'index:gpa', self._gpa_offsets(low, high)
+
+        for field, op, value in self.conditions:
+            if field == 'name' and op == 'startswith' and FileManager.NAME_INDEX.is_current(filename):
+                return 'index:name', self._name_offsets(value)
+        return 'scan', None
+
+    def _equal_offsets(self, index, key):
+        for entry_key, offset in index.iter_from(self.filename, key):
+            if entry_key != key:
+                return
+            yield offset
+
+    def _gpa_bounds(self):
+        low = high = None
+        for field, op, value in self.conditions:
+            if field != 'gpa':
+                continue
+            if op in ('gt', 'gte', 'eq'):
+                low = value if low is None else max(low, value)
+            if op in ('lt', 'lte', 'eq'):
+                high = value if high is None else min(high, value)
+        return low, high
+
+    def _gpa_offsets(self, low, high):
+        start = float('-inf') if low is None else float(low)
+        for gpa, offset in FileManager.GPA_INDEX.iter_from(self.filename, start):
+            if high is not None and gpa > high:
+                return
+            yield offset
+
+    def _name_offsets(self, prefix: str):
+        # The name index holds casefolded keys; the condition re-checks case
+        key_prefix = prefix.casefold().encode('utf-8')[:Student.FIELD_LENGTHS['name']]
+        key_prefix = key_prefix.decode('utf-8', 'ignore').encode('utf-8')
+        for entry_key, offset in FileManager.NAME_INDEX.iter_from(self.filename, key_prefix):
+            if not entry_key.startswith(key_prefix):
+                return
+            yield offset
+
+    # --- Execution ---
+
+    def _matches(self, get) -> bool:
+        return all(self.OPERATORS[op](get(field), value) for field, op, value in self.conditions)
+
+    def _project(self, get):
+        if self.fields is None:
+            return Student(get('id'), get('name'), get('gpa'), get('dept'))
+        return {field: get(field) for field in self.fields}
+
+    def _from_offsets(self, offsets, metadata: dict):
+        for s in FileManager._read_records_at(self.filename, offsets, metadata):
+            get = lambda field: getattr(s, field)
+            if self._matches(get):
+                yield s if self.fields is None else self._project(get)
+
+    def _fixed_tests(self):
+        """
+        Compiles the conditions into tests on a mapped FIXED record. String
+        equality compares raw bytes, other tests decode just their field.
+        The cheap raw-byte tests are placed first.
+        """
+        raw_tests = []
+        tests = []
+        for field, op, value in self.conditions:
+            if op == 'eq' and field in ('name', 'dept'):
+                width = Student.FIELD_LENGTHS[field]
+                raw_value = str(value).encode('utf-8')
+                if len(raw_value) > width:
+                    # Could never have been stored in full
+                    raw_tests.append(lambda buf, offset: False)
+                    continue
+                field_slice = Student.FIELD_SLICES[field]
+                raw_tests.append(lambda buf, offset, s=field_slice, v=raw_value.ljust(width):
+                                 buf[offset + s.start:offset + s.stop] == v)
+            else:
+                test = self.OPERATORS[op]
+                tests.append(lambda buf, offset, f=field, t=test, v=value:
+                             t(Student.decode_fixed_field(buf, f, offset), v))
+        return raw_tests + tests
+
+    def _scan_fixed(self, metadata: dict):
+        tests = self._fixed_tests()
+        tombstone = FileManager.TOMBSTONE[0]
+        decode = Student.decode_fixed_field
+        for buf, stride in FileManager._iter_slot_chunks(self.filename, metadata):
+            for offset in range(0, len(buf) - Student.RECORD_LENGTH + 1, stride):
+                if buf[offset] == tombstone:
+                    continue
+                try:
+                    if all(test(buf, offset) for test in tests):
+                        yield self._project(lambda field: decode(buf, field, offset))
+                except ValueError:
+                    continue
+
+    # Position of each field in an unpacked BINARY record and its decoder
+    BINARY_COLUMNS = {
+        'id': (0, lambda value: value),
+        'gpa': (1, lambda value: round(value, 2)),
+        'name': (2, lambda value: value.decode('utf-8').strip()),
+        'dept': (3, lambda value: value.decode('utf-8').strip()),
+    }
+
+    def _binary_tests(self):
+        """
+        Compiles the conditions into tests on an unpacked BINARY record, with
+        string equality compared on the raw bytes as for FIXED records.
+        """
+        raw_tests = []
+        tests = []
+        for field, op, value in self.conditions:
+            position, decode = self.BINARY_COLUMNS[field]
+            if op == 'eq' and field in ('name', 'dept'):
+                width = Student.FIELD_LENGTHS[field]
+                raw_value = str(value).encode('utf-8')
+                if len(raw_value) > width:
+                    raw_tests.append(lambda values: False)
+                    continue
+                raw_tests.append(lambda values, p=position, v=raw_value.ljust(width): values[p] == v)
+            else:
+                test = self.OPERATORS[op]
+                tests.append(lambda values, p=position, d=decode, t=test, v=value: t(d(values[p]), v))
+        return raw_tests + tests
+
+    def _scan_binary(self, metadata: dict):
+        tests = self._binary_tests()
+        columns = self.BINARY_COLUMNS
+        record = Student.BINARY_STRUCT
+        deleted = Student.BINARY_DELETED_ID
+        for buf, _ in FileManager._iter_slot_chunks(self.filename, metadata):
+            usable = len(buf) - len(buf) % record.size
+            for values in record.iter_unpack(buf[:usable]):
+                if values[0] == deleted:
+                    continue
+                try:
+                    if all(test(values) for test in tests):
+                        yield self._project(lambda field, values=values: columns[field][1](values[columns[field][0]]))
+                except ValueError:
+                    continue
+
+    def _scan_columnar(self):
+        selected = self.fields if self.fields is not None else self.FIELDS
+        with open(self.filename, 'rb') as f:
+            for group in ColumnarFormat.iter_groups(f, len(f.readline())):
+                if not all(ColumnarFormat.may_match(group, field, op, value)
+                           for field, op, value in self.conditions):
+                    continue
+
+                columns = {}
+                positions = range(group.rows)
+                for field, op, value in self.conditions:
+                    if field not in columns:
+                        columns[field] = ColumnarFormat.read_column(f, group, field)
+                    column, test = columns[field], self.OPERATORS[op]
+                    positions = [i for i in positions if test(column[i], value)]
+                    if not positions:
+                        break
+                if not positions:
+                    continue
+
+                for field in selected:
+                    if field not in columns:
+                        columns[field] = ColumnarFormat.read_column(f, group, field)
+                for i in positions:
+                    yield self._project(lambda field: columns[field][i])
+
+    def _scan_delimited(self, metadata: dict):
+        delimiter = metadata.get('DELIMITER', '|')
+        columns = self.DELIMITED_COLUMNS
+        with open(self.filename, 'rb') as f:
+            f.readline()  # Skip header
+            for raw in f:
+                if raw.startswith(FileManager.TOMBSTONE):
+                    continue
+                parts = raw.decode('utf-8').rstrip('\r\n').split(delimiter)
+                if len(parts) < 4:
+                    continue
+
+                def get(field, parts=parts):
+                    position, parse = columns[field]
+                    return parse(parts[position])
+
+                try:
+                    if self._matches(get):
+                        yield self._project(get)
+                except ValueError:
+                    continue
@@ -0,0 +1,577 @@
+import bisect
+import heapq
+import itertools
+import json
+import os
+import struct
+
+
+class SortedIndex:
+    """
+    A persistent index of (key, byte offset) pairs stored next to a data file.
+    Entries are fixed-size and kept sorted, so lookups are a binary search
+    over seeks instead of a scan of the data file.
+
+    Each index covers one Student field. `key_func` turns the field value
+    into the stored key (identity by default), e.g. to fit strings into the
+    fixed-size key slot.
+
+    The index header records the size and modification time of the data file
+    it was built against. If either changes behind our back the index is
+    considered stale and gets rebuilt on next use.
+
+    Single inserts and removals don't shift the sorted file: they are
+    appended to a delta log (<index>.delta) that reads merge in, and the
+    log is folded into the sorted file once it holds DELTA_MAX entries.
+    """
+
+    MAGIC = b'SIDX'
+    HEADER = struct.Struct('<4sQQ')  # magic, data file size, data file mtime_ns
+
+    DELTA_SUFFIX = '.delta'
+    DELTA_MAX = 1024
+
+    def __init__(self, suffix: str, field: str, key_format: str, key_func=None):
+        self.suffix = suffix
+        self.field = field
+        self.entry = struct.Struct('<' + key_format + 'Q')
+        # Delta log records: an entry plus +1 (inserted) or -1 (removed)
+        self.change = struct.Struct('<' + key_format + 'Qb')
+        self.key_func = key_func or (lambda value: value)
+        # Last replay of each delta log, as (log bytes, added, removed)
+        self._replays = {}
+
+    def key_of(self, student):
+        return self.key_func(getattr(student, self.field))
+
+    def path(self, filename: str) -> str:
+        return filename + self.suffix
+
+    def delta_path(self, filename: str) -> str:
+        return self.path(filename) + self.DELTA_SUFFIX
+
+    @staticmethod
+    def _stamp(filename: str):
+        st = os.stat(filename)
+        return st.st_size, st.st_mtime_ns
+
+    def is_current(self, filename: str) -> bool:
+        """
+        True if the index exists and matches the data file on disk.
+        """
+        try:
+            with open(self.path(filename), 'rb') as f:
+                header = f.read(self.HEADER.size)
+        except FileNotFoundError:
+            return False
+        if len(header) < self.HEADER.size:
+            return False
+        magic, size, mtime_ns = self.HEADER.unpack(header)
+        return magic == self.MAGIC and (size, mtime_ns) == self._stamp(filename)
+
+    def write(self, filename: str, entries):
+        """
+        Writes a fresh index from an iterable of (key, offset) pairs.
+        Must be called after the data file itself has been written.
+        """
+        entries = sorted(entries)
+        pack = self.entry.pack
+        size, mtime_ns = self._stamp(filename)
+        self._remove_delta(filename)
+        with open(self.path(filename), 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, size, mtime_ns))
+            f.write(b''.join(pack(key, offset) for key, offset in entries))
+
+    def remove_file(self, filename: str):
+        self._remove_delta(filename)
+        if os.path.exists(self.path(filename)):
+            os.remove(self.path(filename))
+
+    def _remove_delta(self, filename: str):
+        if os.path.exists(self.delta_path(filename)):
+            os.remove(self.delta_path(filename))
+
+    def _load_delta(self, filename: str):
+        """
+        Replays the delta log. Returns (sorted entries inserted since the
+        last fold, sorted entries of the sorted file removed since).
+        """
+        path = self.delta_path(filename)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._replays.pop(path, None)
+            return [], []
+        data = data[:len(data) - len(data) % self.change.size]
+
+        # The log only grows between folds: a cached replay of a prefix of
+        # it is extended with the new records
+        replay = self._replays.get(path)
+        if replay is not None and data.startswith(replay[0]):
+            if len(data) == len(replay[0]):
+                return replay[1], replay[2]
+            added, removed = set(replay[1]), set(replay[2])
+            new = data[len(replay[0]):]
+        else:
+            added, removed = set(), set()
+            new = data
+        for *entry, op in self.change.iter_unpack(new):
+            entry = tuple(entry)
+            if op > 0:
+                if entry in removed:
+                    removed.discard(entry)
+                else:
+                    added.add(entry)
+            elif entry in added:
+                added.discard(entry)
+            else:
+                removed.add(entry)
+        replay = (data, sorted(added), sorted(removed))
+        self._replays[path] = replay
+        return replay[1], replay[2]
+
+    def _log(self, filename: str, entries, op: int):
+        """
+        Appends changes to the delta log, folding it into the sorted file
+        once it is full, and re-stamps the index.
+        """
+        pack = self.change.pack
+        with open(self.delta_path(filename), 'ab') as f:
+            f.write(b''.join(pack(key, offset, op) for key, offset in entries))
+            logged = f.tell() // self.change.size
+        if logged >= self.DELTA_MAX:
+            self._fold(filename)
+        else:
+            self.touch(filename)
+
+    def _fold(self, filename: str, new_entries=()):
+        """
+        Applies the delta log and `new_entries` to the sorted file and drops
+        the log. The sorted file is copied as raw byte runs between the
+        positions of the changes, which are found by binary search.
+        """
+        added, removed = self._load_delta(filename)
+        added = sorted(added + list(new_entries))
+        with open(self.path(filename), 'rb') as f:
+            f.seek(self.HEADER.size)
+            data = f.read()
+        size = self.entry.size
+        count = len(data) // size
+
+        def position(entry):
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.entry.unpack_from(data, mid * size) < entry:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        # Inserts go before the entry at their position, removals skip it
+        changes = sorted([(position(entry), 0, entry) for entry in added] +
+                         [(position(entry), 1, entry) for entry in removed])
+        parts = []
+        copied = 0
+        for pos, removal, entry in changes:
+            parts.append(data[copied * size:pos * size])
+            copied = pos
+            if removal:
+                copied += 1
+            else:
+                parts.append(self.entry.pack(*entry))
+        parts.append(data[copied * size:count * size])
+
+        size_stamp, mtime_ns = self._stamp(filename)
+        self._remove_delta(filename)
+        with open(self.path(filename), 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, size_stamp, mtime_ns))
+            f.write(b''.join(parts))
+
+    def _iter_main(self, f, pos: int, removed):
+        """
+        Yields the entries of the sorted file from position `pos`, skipping
+        those removed in the delta log.
+        """
+        f.seek(self.HEADER.size + pos * self.entry.size)
+        while True:
+            data = f.read(self.entry.size * 1024)
+            if len(data) < self.entry.size:
+                return
+            usable = len(data) - len(data) % self.entry.size
+            for entry in self.entry.iter_unpack(data[:usable]):
+                if not removed or entry not in removed:
+                    yield entry
+
+    @staticmethod
+    def _contains(entries, entry) -> bool:
+        pos = bisect.bisect_left(entries, entry)
+        return pos < len(entries) and entries[pos] == entry
+
+    def _restamp(self, f, filename: str):
+        size, mtime_ns = self._stamp(filename)
+        f.seek(0)
+        f.write(self.HEADER.pack(self.MAGIC, size, mtime_ns))
+
+    def _count(self, f) -> int:
+        f.seek(0, os.SEEK_END)
+        return (f.tell() - self.HEADER.size) // self.entry.size
+
+    def _entry_at(self, f, pos: int):
+        f.seek(self.HEADER.size + pos * self.entry.size)
+        return self.entry.unpack(f.read(self.entry.size))
+
+    def _lower_bound(self, f, count: int, target) -> int:
+        # First position whose (key, offset) is >= target.
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry_at(f, mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, filename: str, key):
+        """
+        Returns the offset of the first record with the given key, or None.
+        """
+        for found_key, offset in self.iter_from(filename, key):
+            return offset if found_key == key else None
+        return None
+
+    def iter_from(self, filename: str, key):
+        """
+        Yields (key, offset) entries in sorted order, starting at the first
+        entry whose key is >= `key`. Callers stop iterating when done.
+        """
+        added, removed = self._load_delta(filename)
+        with open(self.path(filename), 'rb') as f:
+            pos = self._lower_bound(f, self._count(f), (key, 0))
+            main = self._iter_main(f, pos, set(removed))
+            if not added:
+                yield from main
+                return
+            yield from heapq.merge(main, added[bisect.bisect_left(added, (key, 0)):])
+
+    def iter_reverse(self, filename: str):
+        """
+        Yields (key, offset) entries from the largest key down, reading the
+        index backwards in blocks.
+        """
+        added, removed = self._load_delta(filename)
+        removed = set(removed)
+        block = self.entry.size * 1024
+
+        def main():
+            with open(self.path(filename), 'rb') as f:
+                end = self.HEADER.size + self._count(f) * self.entry.size
+                while end > self.HEADER.size:
+                    start = max(self.HEADER.size, end - block)
+                    f.seek(start)
+                    data = f.read(end - start)
+                    for entry in reversed(list(self.entry.iter_unpack(data))):
+                        if entry not in removed:
+                            yield entry
+                    end = start
+
+        yield from heapq.merge(main(), reversed(added), reverse=True)
+
+    def insert(self, filename: str, key, offset: int):
+        """
+        Adds one entry and re-stamps the index.
+        """
+        self._log(filename, [(key, offset)], 1)
+
+    def count(self, filename: str) -> int:
+        added, removed = self._load_delta(filename)
+        with open(self.path(filename), 'rb') as f:
+            return self._count(f) + len(added) - len(removed)
+
+    def entries(self, filename: str):
+        """
+        Returns every (key, offset) entry in sorted order.
+        """
+        added, removed = self._load_delta(filename)
+        with open(self.path(filename), 'rb') as f:
+            return list(heapq.merge(self._iter_main(f, 0, set(removed)), added))
+
+    def entries_at(self, filename: str, start: int, count: int):
+        """
+        Returns up to `count` entries in sorted order starting at position
+        `start`. Without pending changes this is a single seek; otherwise
+        the start is found by binary search over merged positions.
+        """
+        start, count = max(start, 0), max(count, 0)
+        added, removed = self._load_delta(filename)
+        with open(self.path(filename), 'rb') as f:
+            if not added and not removed:
+                f.seek(self.HEADER.size + start * self.entry.size)
+                data = f.read(count * self.entry.size)
+                usable = len(data) - len(data) % self.entry.size
+                return list(self.entry.iter_unpack(data[:usable]))
+
+            # Largest sorted-file position whose merged position is <= start
+            main_pos, added_pos, skip = 0, 0, start
+            lo, hi = 0, self._count(f) - 1
+            while lo <= hi:
+                mid = (lo + hi) // 2
+                entry = self._entry_at(f, mid)
+                before = bisect.bisect_left(added, entry)
+                rank = mid - bisect.bisect_left(removed, entry) + before
+                if rank <= start:
+                    main_pos, added_pos, skip = mid, before, start - rank
+                    lo = mid + 1
+                else:
+                    hi = mid - 1
+
+            merged = heapq.merge(self._iter_main(f, main_pos, set(removed)), added[added_pos:])
+            return list(itertools.islice(merged, skip, skip + count))
+
+    def insert_many(self, filename: str, new_entries):
+        """
+        Adds a batch of entries: logged if the delta log has room, otherwise
+        folded into the sorted file together with the log.
+        """
+        new_entries = list(new_entries)
+        try:
+            logged = os.path.getsize(self.delta_path(filename)) // self.change.size
+        except FileNotFoundError:
+            logged = 0
+        if logged + len(new_entries) < self.DELTA_MAX:
+            self._log(filename, new_entries, 1)
+        else:
+            self._fold(filename, new_entries)
+
+    def remove(self, filename: str, key, offset: int):
+        """
+        Removes one entry (if present) and re-stamps the index.
+        """
+        entry = (key, offset)
+        added, removed = self._load_delta(filename)
+        present = self._contains(added, entry)
+        if not present and not self._contains(removed, entry):
+            with open(self.path(filename), 'rb') as f:
+                count = self._count(f)
+                pos = self._lower_bound(f, count, entry)
+                present = pos < count and self._entry_at(f, pos) == entry
+        if present:
+            self._log(filename, [entry], -1)
+        else:
+            self.touch(filename)
+
+    def touch(self, filename: str):
+        """
+        Re-stamps the index after a data file change that kept every entry valid.
+        """
+        with open(self.path(filename), 'r+b') as f:
+            self._restamp(f, filename)
+
+
+class AvailList:
+    """
+    A stack of byte offsets of deleted (tombstoned) record slots, stored next
+    to a data file. Pushing and popping only touch the end of the sidecar.
+
+    Entries are hints: callers must check that a slot is still a tombstone
+    before reusing it, since the data file may have changed since.
+    """
+
+    ENTRY = struct.Struct('<Q')
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+
+    def path(self, filename: str) -> str:
+        return filename + self.suffix
+
+    def push(self, filename: str, offset: int):
+        with open(self.path(filename), 'ab') as f:
+            f.write(self.ENTRY.pack(offset))
+
+    def pop(self, filename: str):
+        """
+        Removes and returns the most recently freed offset, or None if empty.
+        """
+        try:
+            f = open(self.path(filename), 'r+b')
+        except FileNotFoundError:
+            return None
+        with f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell() - f.tell() % self.ENTRY.size
+            if end == 0:
+                return None
+            f.seek(end - self.ENTRY.size)
+            (offset,) = self.ENTRY.unpack(f.read(self.ENTRY.size))
+            f.truncate(end - self.ENTRY.size)
+            return offset
+
+    def discard(self, filename: str, offset: int):
+        """
+        Removes every entry for `offset`, once its slot was reused other than
+        through pop().
+        """
+        try:
+            f = open(self.path(filename), 'r+b')
+        except FileNotFoundError:
+            return
+        with f:
+            data = f.read()
+            usable = len(data) - len(data) % self.ENTRY.size
+            kept = [entry for entry in self.ENTRY.iter_unpack(data[:usable]) if entry[0] != offset]
+            if len(kept) * self.ENTRY.size == usable:
+                return
+            f.seek(0)
+            f.write(b''.join(self.ENTRY.pack(*entry) for entry in kept))
+            f.truncate()
+
+    def count(self, filename: str) -> int:
+        try:
+            return os.path.getsize(self.path(filename)) // self.ENTRY.size
+        except FileNotFoundError:
+            return 0
+
+    def remove_file(self, filename: str):
+        if os.path.exists(self.path(filename)):
+            os.remove(self.path(filename))
+
+
+class DeptStats:
+    """
+    Running GPA aggregates per department (count, sum, min, max), stored as
+    JSON next to a data file and stamped like SortedIndex.
+
+    Adding a record updates the aggregates in O(1). Removing one can keep
+    count and sum exact, but not min/max when the removed GPA was one of
+    them: the stats are then flagged stale and rebuilt on next read.
+    """
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+
+    def path(self, filename: str) -> str:
+        return filename + self.suffix
+
+    def _load(self, filename: str):
+        try:
+            with open(self.path(filename), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_current(self, filename: str) -> bool:
+        data = self._load(filename)
+        return (data is not None and not data.get('stale')
+                and [data.get('size'), data.get('mtime_ns')] == list(SortedIndex._stamp(filename)))
+
+    def read(self, filename: str):
+        """
+        Returns {dept: [count, sum, min, max]}. Check is_current() first.
+        """
+        return self._load(filename)['depts']
+
+    def write(self, filename: str, depts: dict, stale: bool = False):
+        size, mtime_ns = SortedIndex._stamp(filename)
+        with open(self.path(filename), 'w', encoding='utf-8') as f:
+            json.dump({'size': size, 'mtime_ns': mtime_ns, 'stale': stale, 'depts': depts}, f)
+
+    def remove_file(self, filename: str):
+        if os.path.exists(self.path(filename)):
+            os.remove(self.path(filename))
+
+    @staticmethod
+    def accumulate(depts: dict, student):
+        """
+        Adds one student to an in-memory {dept: [count, sum, min, max]} dict.
+        """
+        agg = depts.get(student.dept)
+        if agg is None:
+            depts[student.dept] = [1, student.gpa, student.gpa, student.gpa]
+        else:
+            agg[0] += 1
+            agg[1] += student.gpa
+            agg[2] = min(agg[2], student.gpa)
+            agg[3] = max(agg[3], student.gpa)
+
+    def update(self, filename: str, added: dict = None, removed=()):
+        """
+        Merges pre-accumulated `added` aggregates and subtracts the `removed`
+        students, then re-stamps the sidecar.
+        """
+        data = self._load(filename)
+        depts = data['depts']
+        stale = data.get('stale', False)
+
+        for dept, (count, total, low, high) in (added or {}).items():
+            agg = depts.get(dept)
+            if agg is None:
+                depts[dept] = [count, total, low, high]
+            else:
+                depts[dept] = [agg[0] + count, agg[1] + total, min(agg[2], low), max(agg[3], high)]
+
+        for student in removed:
+            agg = depts.get(student.dept)
+            if agg is None:
+                stale = True
+                continue
+            agg[0] -= 1
+            agg[1] -= student.gpa
+            if agg[0] <= 0:
+                del depts[student.dept]
+            elif student.gpa in (agg[2], agg[3]):
+                stale = True
+
+        self.write(filename, depts, stale)
+
+
+class BlockIndex:
+    """
+    The block table of a block-compressed archive, stored next to it and
+    stamped like SortedIndex: the number of records per block and the byte
+    offset of each block's gzip member. The archive's first member holds
+    the header line and ends where block 0 starts; the last offset is the
+    archive size.
+    """
+
+    MAGIC = b'BIDX'
+    HEADER = struct.Struct('<4sQQQ')  # magic, archive size, archive mtime_ns, records per block
+    ENTRY = struct.Struct('<Q')
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+
+    def path(self, filename: str) -> str:
+        return filename + self.suffix
+
+    def is_current(self, filename: str) -> bool:
+        try:
+            with open(self.path(filename), 'rb') as f:
+                header = f.read(self.HEADER.size)
+        except FileNotFoundError:
+            return False
+        if len(header) < self.HEADER.size:
+            return False
+        magic, size, mtime_ns, _ = self.HEADER.unpack(header)
+        return magic == self.MAGIC and (size, mtime_ns) == SortedIndex._stamp(filename)
+
+    def write(self, filename: str, block_records: int, offsets):
+        size, mtime_ns = SortedIndex._stamp(filename)
+        with open(self.path(filename), 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, size, mtime_ns, block_records))
+            f.write(b''.join(self.ENTRY.pack(offset) for offset in offsets))
+
+    def read(self, filename: str):
+        """
+        Returns (records per block, list of block offsets). Check is_current() first.
+        """
+        with open(self.path(filename), 'rb') as f:
+            _, _, _, block_records = self.HEADER.unpack(f.read(self.HEADER.size))
+            data = f.read()
+        usable = len(data) - len(data) % self.ENTRY.size
+        return block_records, [offset for (offset,) in self.ENTRY.iter_unpack(data[:usable])]
+
+    def remove_file(self, filename: str):
+        if os.path.exists(self.path(filename)):
+            os.remove(self.path(filename))
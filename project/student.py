@@ -1,7 +1,13 @@
+import itertools
+import struct
+import sys
+from array import array
+
+
 class Student:
     """
     Represents a student with ID, Name, GPA, and Department.
-    Includes methods for serialization to fixed-length and delimited formats.
+    Includes methods for serialization to fixed-length, delimited and packed binary formats.
     """
     
     # Fixed length configuration (in BYTES)
@@ -12,55 +18,62 @@ class Student:
         'dept': 10
     }
     
+    # Byte slice of each field inside a fixed-length record, and the total length
+    FIELD_SLICES = {}
+    _pos = 0
+    for _field, _length in FIELD_LENGTHS.items():
+        FIELD_SLICES[_field] = slice(_pos, _pos + _length)
+        _pos += _length
+    RECORD_LENGTH = _pos
+    del _field, _length, _pos
+    
+    # Precompiled struct layout of one fixed-length record (no newline)
+    FIXED_STRUCT = struct.Struct(''.join(f"{length}s" for length in FIELD_LENGTHS.values()))
+    
+    # Packed little-endian layout of one BINARY record: uint32 ID, float32 GPA,
+    # then the name and department as fixed-width UTF-8 like FIXED records.
+    # The largest uint32 is reserved as the ID of deleted records.
+    BINARY_STRUCT = struct.Struct(f"<If{FIELD_LENGTHS['name']}s{FIELD_LENGTHS['dept']}s")
+    BINARY_DELETED_ID = 0xFFFFFFFF
+    
+    # No per-instance __dict__: keeps millions of loaded students small
+    __slots__ = ('id', 'name', 'gpa', 'dept')
+    
     def __init__(self, student_id: int, name: str, gpa: float, dept: str):
         self.id = student_id
         self.name = name
         self.gpa = gpa
         self.dept = dept
 
+    @staticmethod
+    def _fit_bytes(value, length: int) -> bytes:
+        """
+        Encodes a value to UTF-8 and pads/truncates it to exactly `length` bytes.
+        Truncation never cuts a multi-byte character in half: any partial
+        character left at the cut is dropped before padding with spaces.
+        """
+        b_val = str(value).encode('utf-8')
+        if len(b_val) > length:
+            b_val = b_val[:length].decode('utf-8', 'ignore').encode('utf-8')
+        return b_val.ljust(length)
+
+    def to_fixed_bytes(self) -> bytes:
+        """
+        Converts the student object to a fixed-length record in BYTES.
+        ID(5), NAME(20), GPA(4), DEPT(10).
+        """
+        fit = self._fit_bytes
+        l_id, l_name, l_gpa, l_dept = self.FIELD_LENGTHS.values()
+        return (fit(str(self.id).zfill(l_id), l_id) + fit(self.name, l_name)
+                + fit(f"{self.gpa:.2f}", l_gpa) + fit(self.dept, l_dept))
+
     def to_fixed_length(self) -> str:
         """
         Converts the student object to a fixed-length string record.
         ID(5), NAME(20), GPA(4), DEPT(10) - Lengths in BYTES.
         Returns a string that, when encoded in UTF-8, matches the byte lengths.
         """
-        # Helper to pad/truncate to fixed bytes
-        def format_field(value: str, length: int) -> str:
-            # Encode to bytes
-            b_val = str(value).encode('utf-8')
-            # Truncate if too long
-            if len(b_val) > length:
-                b_val = b_val[:length]
-                # Ensure we didn't cut a multi-byte char in half
-                # If the last byte is a continuation byte (0x80-0xBF), remove it
-                while b_val and (b_val[-1] & 0xC0) == 0x80:
-                    b_val = b_val[:-1]
-            # Pad with spaces
-            b_val = b_val + b' ' * (length - len(b_val))
-            # Decode back to string (this ensures it writes correctly as UTF-8)
-            return b_val.decode('utf-8')
-
-        id_str = format_field(str(self.id).zfill(self.FIELD_LENGTHS['id']), self.FIELD_LENGTHS['id'])
-        
-        # For ID, zfill operates on string, so we might need to be careful if ID was somehow unicode? 
-        # But ID is int. str(int) is ASCII. So zfill is fine.
-        # Actually, let's just use the helper for consistency, but zfill is string op.
-        # Let's redo ID:
-        # ID is usually ASCII digits.
-        s_id = str(self.id).zfill(self.FIELD_LENGTHS['id'])
-        # Ensure it fits (though 5 digits is max for 5 bytes)
-        id_str = format_field(s_id, self.FIELD_LENGTHS['id'])
-
-        name_str = format_field(self.name, self.FIELD_LENGTHS['name'])
-        
-        # GPA
-        s_gpa = f"{self.gpa:.2f}"
-        gpa_str = format_field(s_gpa, self.FIELD_LENGTHS['gpa'])
-        
-        # Dept
-        dept_str = format_field(self.dept, self.FIELD_LENGTHS['dept'])
-        
-        return f"{id_str}{name_str}{gpa_str}{dept_str}"
+        return self.to_fixed_bytes().decode('utf-8')
 
     def to_delimited(self, delimiter: str = "|") -> str:
         """
@@ -74,44 +87,139 @@ class Student:
         Creates a Student object from a fixed-length string record.
         Expects the record to be a string that was decoded from UTF-8 bytes.
         """
-        # We need to operate on bytes to respect the field lengths
-        b_record = record.encode('utf-8')
-        
-        expected_len = sum(cls.FIELD_LENGTHS.values())
-        # Note: b_record length might be slightly different if we stripped newline before passing here?
-        # The caller usually strips newline.
-        
-        if len(b_record) < expected_len:
-             # It's possible that the record is short.
-             # But let's try to parse what we have.
-             pass
-            
-        offset = 0
-        
-        # ID
-        l_id = cls.FIELD_LENGTHS['id']
-        b_id = b_record[offset : offset + l_id]
-        s_id = int(b_id.decode('utf-8').strip())
-        offset += l_id
-        
-        # Name
-        l_name = cls.FIELD_LENGTHS['name']
-        b_name = b_record[offset : offset + l_name]
-        s_name = b_name.decode('utf-8').strip()
-        offset += l_name
-        
-        # GPA
-        l_gpa = cls.FIELD_LENGTHS['gpa']
-        b_gpa = b_record[offset : offset + l_gpa]
-        s_gpa = float(b_gpa.decode('utf-8').strip())
-        offset += l_gpa
-        
-        # Dept
-        l_dept = cls.FIELD_LENGTHS['dept']
-        b_dept = b_record[offset : offset + l_dept]
-        s_dept = b_dept.decode('utf-8').strip()
-        
-        return cls(s_id, s_name, s_gpa, s_dept)
+        # Field lengths are in bytes, so parse the encoded record
+        return cls.from_fixed_bytes(record.encode('utf-8'))
+
+    @classmethod
+    def decode_fixed_field(cls, buf, field: str, start: int = 0):
+        """
+        Decodes a single field of the fixed-length record starting at `start`
+        in a bytes-like buffer (bytes, mmap, ...), without touching the others.
+        """
+        field_slice = cls.FIELD_SLICES[field]
+        raw = buf[start + field_slice.start : start + field_slice.stop]
+        if field == 'id':
+            return int(raw)
+        if field == 'gpa':
+            return float(raw)
+        return raw.decode('utf-8').strip()
+
+    @classmethod
+    def from_fixed_bytes(cls, buf, start: int = 0):
+        """
+        Creates a Student object from the fixed-length record starting at `start`
+        in a bytes-like buffer. Fields are sliced directly, with no str round trip.
+        """
+        return cls(
+            cls.decode_fixed_field(buf, 'id', start),
+            cls.decode_fixed_field(buf, 'name', start),
+            cls.decode_fixed_field(buf, 'gpa', start),
+            cls.decode_fixed_field(buf, 'dept', start),
+        )
+
+    @classmethod
+    def encode_fixed_batch(cls, students, newline: bytes = b"\n") -> bytes:
+        """
+        Encodes many students into consecutive fixed-length records in one call,
+        each followed by `newline`. Uses the precompiled FIXED_STRUCT layout.
+        """
+        pack = struct.Struct(cls.FIXED_STRUCT.format + f"{len(newline)}s").pack
+        fit = cls._fit_bytes
+        l_id, l_name, l_gpa, l_dept = cls.FIELD_LENGTHS.values()
+        return b''.join(
+            pack(fit(str(s.id).zfill(l_id), l_id), fit(s.name, l_name),
+                 fit(f"{s.gpa:.2f}", l_gpa), fit(s.dept, l_dept), newline)
+            for s in students
+        )
+
+    @classmethod
+    def decode_fixed_batch(cls, buf, newline_len: int = 1):
+        """
+        Decodes consecutive fixed-length records (each followed by a newline of
+        `newline_len` bytes) from a bytes-like buffer in one call.
+        Malformed records (including deleted ones) are skipped. A final record
+        without its newline is still decoded; shorter trailing bytes are ignored.
+        """
+        record = struct.Struct(cls.FIXED_STRUCT.format + f"{newline_len}x")
+        usable = len(buf) - len(buf) % record.size
+        rows = record.iter_unpack(buf[:usable])
+        if len(buf) - usable >= cls.RECORD_LENGTH:
+            # Last record of a file that doesn't end with a newline
+            rows = itertools.chain(rows, [cls.FIXED_STRUCT.unpack_from(buf, usable)])
+        students = []
+        for b_id, b_name, b_gpa, b_dept in rows:
+            try:
+                students.append(cls(int(b_id), b_name.decode('utf-8').strip(),
+                                    float(b_gpa), b_dept.decode('utf-8').strip()))
+            except ValueError:
+                continue
+        return students
+
+    def to_binary_bytes(self) -> bytes:
+        """
+        Converts the student object to a packed BINARY record.
+        Raises ValueError if the ID does not fit in an unsigned 32-bit field.
+        """
+        if not 0 <= self.id < self.BINARY_DELETED_ID:
+            raise ValueError(f"ID {self.id} is out of range for a Binary record.")
+        return self.BINARY_STRUCT.pack(self.id, self.gpa,
+                                       self._fit_bytes(self.name, self.FIELD_LENGTHS['name']),
+                                       self._fit_bytes(self.dept, self.FIELD_LENGTHS['dept']))
+
+    @classmethod
+    def from_binary_bytes(cls, buf, start: int = 0):
+        """
+        Creates a Student object from the BINARY record starting at `start` in
+        a bytes-like buffer. The float32 GPA is rounded back to 2 decimals.
+        Raises ValueError for deleted or truncated records.
+        """
+        try:
+            s_id, s_gpa, b_name, b_dept = cls.BINARY_STRUCT.unpack_from(buf, start)
+        except struct.error:
+            raise ValueError("Record is truncated.")
+        if s_id == cls.BINARY_DELETED_ID:
+            raise ValueError("Record is deleted.")
+        return cls(s_id, b_name.decode('utf-8').strip(), round(s_gpa, 2), b_dept.decode('utf-8').strip())
+
+    @classmethod
+    def encode_binary_batch(cls, students) -> bytes:
+        """
+        Encodes many students into consecutive BINARY records in one call.
+        """
+        return b''.join(s.to_binary_bytes() for s in students)
+
+    @classmethod
+    def decode_binary_batch(cls, buf):
+        """
+        Decodes consecutive BINARY records from a bytes-like buffer in one call.
+        Deleted records are skipped; a trailing partial record is ignored.
+        """
+        record = cls.BINARY_STRUCT
+        usable = len(buf) - len(buf) % record.size
+        deleted = cls.BINARY_DELETED_ID
+        # GPAs repeat a lot, so each distinct float32 is only rounded once
+        rounded = {}
+        students = []
+        for s_id, s_gpa, b_name, b_dept in record.iter_unpack(buf[:usable]):
+            if s_id == deleted:
+                continue
+            gpa = rounded.get(s_gpa)
+            if gpa is None:
+                gpa = rounded[s_gpa] = round(s_gpa, 2)
+            students.append(cls(s_id, b_name.decode('utf-8').strip(), gpa, b_dept.decode('utf-8').strip()))
+        return students
+
+    @classmethod
+    def encode_delimited_batch(cls, students, delimiter: str = "|", newline: bytes = b"\n") -> bytes:
+        """
+        Encodes many students into consecutive delimited records in one call,
+        each followed by `newline`. The records are joined as text and
+        encoded to UTF-8 once.
+        """
+        end = newline.decode('ascii')
+        return ''.join(
+            f"{s.id}{delimiter}{s.name}{delimiter}{s.gpa}{delimiter}{s.dept}{end}" for s in students
+        ).encode('utf-8')
 
     @classmethod
     def from_delimited(cls, record: str, delimiter: str = "|"):
@@ -131,3 +239,44 @@ class Student:
 
     def __str__(self):
         return f"ID: {self.id}, Name: {self.name}, GPA: {self.gpa}, Dept: {self.dept}"
+
+
+class StudentBatch:
+    """
+    A compact, column-oriented container of students.
+    IDs and GPAs are stored in typed arrays, names in a list, and department
+    names are interned so repeated values share one string.
+    Iterating or indexing yields Student objects built on demand.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.names = []
+        self.gpas = array('d')
+        self.depts = []
+
+    @classmethod
+    def from_students(cls, students):
+        batch = cls()
+        batch.extend(students)
+        return batch
+
+    def append(self, student: Student):
+        self.ids.append(student.id)
+        self.names.append(student.name)
+        self.gpas.append(student.gpa)
+        self.depts.append(sys.intern(student.dept))
+
+    def extend(self, students):
+        for student in students:
+            self.append(student)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Student:
+        return Student(self.ids[index], self.names[index], self.gpas[index], self.depts[index])
+
+    def __iter__(self):
+        for row in zip(self.ids, self.names, self.gpas, self.depts):
+            yield Student(*row)
@@ -0,0 +1,388 @@
+import os
+
+from student import Student
+from record_index import DeptStats
+from columnar import ColumnarFormat
+from file_manager import FileManager
+
+
+class StudentFile:
+    """
+    A session on one data file for record-level work:
+
+        with FileManager.open("students.txt") as records:
+            records.add(Student(1, "Ada", 4.0, "CS"))
+            student = records.search(1)
+
+    The header is parsed once, and the file stays open in a small pool of
+    unbuffered handles: one for reading, plus one for writing opened on the
+    first change and then used for reads too. Which indexes and stats
+    sidecars are current is checked on the first change; the session's own
+    writes keep them current afterwards. Changes made to the file by others
+    while a session is open are not detected.
+
+    FileManager's single-record methods (add_student, search_student,
+    get_record_by_rrn, update_student, update_record_by_rrn, delete_student)
+    and iter_students are thin wrappers opening one session per call.
+    """
+
+    # Bytes read per call while looking for the end of a DELIMITED line
+    LINE_CHUNK = 256
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._handles = {}
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+    def _load(self):
+        FileManager._require_uncompressed(self.filename)
+        header = self._read_line(0)
+        try:
+            header_line = header.decode('utf-8').strip()
+        except UnicodeDecodeError:
+            raise ValueError("Invalid file format: Missing header.")
+        self.metadata = FileManager._parse_header(header_line)
+        self.type = self.metadata.get('TYPE')
+        self.header_len = len(header)
+        newline = b'\r\n' if header.endswith(b'\r\n') else b'\n'
+        self.terminator = b'' if self.type == FileManager.TYPE_BINARY else newline
+        self.stride = None
+        if self.type in FileManager.SLOT_TYPES:
+            self.stride = FileManager._slot_layout(header, self.metadata)[1]
+        self._indexes = None
+        self._has_stats = None
+
+    # --- Handles ---
+
+    def _handle(self, mode: str):
+        handle = self._handles.get(mode)
+        if handle is None:
+            try:
+                handle = open(self.filename, mode, buffering=0)
+            except FileNotFoundError:
+                raise FileNotFoundError("File does not exist.")
+            self._handles[mode] = handle
+        return handle
+
+    def _reader(self):
+        # Once the write handle is open it serves reads as well
+        return self._handles.get('r+b') or self._handle('rb')
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        f = self._reader()
+        f.seek(offset)
+        return f.read(size)
+
+    def _read_line(self, offset: int) -> bytes:
+        f = self._reader()
+        f.seek(offset)
+        line = b''
+        while True:
+            chunk = f.read(self.LINE_CHUNK)
+            if not chunk:
+                return line
+            end = chunk.find(b'\n')
+            if end >= 0:
+                return line + chunk[:end + 1]
+            line += chunk
+
+    def _write_at(self, offset: int, data: bytes):
+        f = self._handle('r+b')
+        f.seek(offset)
+        f.write(data)
+
+    def _read_record(self, offset: int):
+        """
+        Reads and parses the record at a byte offset; None if deleted.
+        """
+        if self.type in FileManager.SLOT_TYPES:
+            raw = self._read_at(offset, FileManager._record_size(self.metadata))
+        else:
+            raw = self._read_line(offset)
+        return FileManager._parse_line(raw, self.metadata)
+
+    # --- Sidecars ---
+
+    def _sidecars(self):
+        """
+        Returns (current indexes, whether the stats are current). Looked up
+        before the first change; every later change updates them.
+        """
+        if self._indexes is None:
+            self._indexes = FileManager._current_indexes(self.filename)
+            self._has_stats = FileManager.STATS.is_current(self.filename)
+        return self._indexes, self._has_stats
+
+    def _ensure_index(self, index):
+        if self._indexes is not None and index in self._indexes:
+            return
+        FileManager._ensure_index(self.filename, self.metadata, index)
+        if self._indexes is not None:
+            self._indexes.append(index)
+
+    # --- Records ---
+
+    def scan(self):
+        """
+        Lazily yields every live Student in file order.
+        """
+        if self.type == FileManager.TYPE_COLUMNAR:
+            for batch in FileManager._iter_row_groups(self.filename):
+                yield from batch
+        elif self.type in FileManager.SLOT_TYPES:
+            for batch in FileManager._iter_slot_batches(self.filename, self.metadata):
+                yield from batch
+        else:
+            for _, student in FileManager._iter_with_offsets(self.filename, self.metadata):
+                yield student
+
+    def add(self, student: Student):
+        """
+        Appends a student, reusing a deleted FIXED or BINARY slot when one
+        is available.
+        """
+        if self.type == FileManager.TYPE_COLUMNAR:
+            FileManager.add_students(self.filename, [student])
+            return
+
+        if self.type in FileManager.SLOT_TYPES:
+            offset = self._pop_free_slot()
+            if offset is not None:
+                self._overwrite(offset, student)
+                FileManager._notify(self.filename, 'add', [student])
+                return
+
+        record = FileManager._encode_record(student, self.metadata)
+        indexes, has_stats = self._sidecars()
+        FileManager._clear_sorted(self.filename, self.metadata)
+
+        # The new record starts at the current end of file
+        f = self._handle('r+b')
+        offset = f.seek(0, os.SEEK_END)
+        f.write(record + self.terminator)
+
+        stored = self._as_stored(student, record)
+        for index in indexes:
+            index.insert(self.filename, index.key_of(stored), offset)
+        if has_stats:
+            added = {}
+            DeptStats.accumulate(added, stored)
+            FileManager.STATS.update(self.filename, added)
+        FileManager._notify(self.filename, 'add', [student])
+
+    def get(self, rrn: int):
+        """
+        Returns the record at a Relative Record Number, or None if it is out
+        of range or deleted. FIXED, BINARY and COLUMNAR files only.
+        """
+        if self.type == FileManager.TYPE_COLUMNAR:
+            if rrn < 0:
+                return None
+            f = self._reader()
+            for group in ColumnarFormat.iter_groups(f, self.header_len):
+                if rrn < group.rows:
+                    return ColumnarFormat.read_row(f, group, rrn)
+                rrn -= group.rows
+            return None
+
+        if self.type not in FileManager.SLOT_TYPES:
+            raise ValueError("RRN access is only supported for Fixed-Length and Binary files.")
+        if rrn < 0:
+            return None
+        size = FileManager._record_size(self.metadata)
+        raw = self._read_at(self.header_len + rrn * self.stride, size)
+        if len(raw) < size:
+            return None
+        try:
+            return FileManager._decode_slot(raw, 0, self.metadata)
+        except ValueError:
+            return None  # Deleted or malformed record
+
+    def search(self, student_id: int):
+        """
+        Returns the student with the given ID, or None. Uses the ID index
+        (built on first use); FIXED and BINARY files sorted by ID are
+        binary-searched directly and COLUMNAR files scanned by zone map.
+        """
+        if self.type == FileManager.TYPE_COLUMNAR:
+            return next(iter(FileManager.query(self.filename).where(id=student_id).limit(1)), None)
+        if self.type in FileManager.SLOT_TYPES and FileManager._sorted_by(self.metadata) == 'id':
+            return self._binary_search_id(student_id)
+
+        self._ensure_index(FileManager.ID_INDEX)
+        offset = FileManager.ID_INDEX.lookup(self.filename, student_id)
+        if offset is None:
+            return None
+        student = self._read_record(offset)
+        return student if student is not None and student.id == student_id else None
+
+    def update(self, student_id: int, new_student_data: Student) -> bool:
+        """
+        Replaces the student with the given ID. FIXED and BINARY records are
+        patched in place; DELIMITED ones are tombstoned and appended.
+        Returns False if there is no such student.
+        """
+        self._ensure_index(FileManager.ID_INDEX)
+        offset = FileManager.ID_INDEX.lookup(self.filename, student_id)
+        if offset is None:
+            return False
+
+        if self.type in FileManager.SLOT_TYPES:
+            old = self._overwrite(offset, new_student_data)
+            FileManager._notify(self.filename, 'update', [(old, new_student_data)])
+        else:
+            self._tombstone(offset)
+            self.add(new_student_data)
+        return True
+
+    def update_at(self, rrn: int, new_student_data: Student) -> bool:
+        """
+        Overwrites the FIXED or BINARY record at an RRN. Returns False if the
+        RRN is out of range.
+        """
+        FileManager._require_record_offsets(self.metadata)
+        if self.type not in FileManager.SLOT_TYPES:
+            raise ValueError("RRN access is only supported for Fixed-Length and Binary files.")
+
+        file_size = self._reader().seek(0, os.SEEK_END)
+        target_offset = self.header_len + rrn * self.stride
+        if rrn < 0 or target_offset + FileManager._record_size(self.metadata) > file_size:
+            return False
+
+        old = self._overwrite(target_offset, new_student_data)
+        if old is None:
+            # The deleted slot is live again, so it no longer counts as free
+            FileManager.AVAIL_LIST.discard(self.filename, target_offset)
+            FileManager._notify(self.filename, 'add', [new_student_data])
+        else:
+            FileManager._notify(self.filename, 'update', [(old, new_student_data)])
+        return True
+
+    def delete(self, student_id: int) -> bool:
+        """
+        Deletes every record with the given ID by tombstoning it, then
+        compacts the file once COMPACT_RATIO of the slots are dead.
+        """
+        self._ensure_index(FileManager.ID_INDEX)
+
+        found = False
+        offset = FileManager.ID_INDEX.lookup(self.filename, student_id)
+        while offset is not None:
+            self._tombstone(offset)
+            found = True
+            offset = FileManager.ID_INDEX.lookup(self.filename, student_id)
+
+        if found and FileManager._needs_compaction(self.filename):
+            # Compaction replaces the file, which Windows refuses while it
+            # is open; the session reopens the new file afterwards
+            self.close()
+            FileManager.compact(self.filename)
+            self._load()
+        return found
+
+    # --- Slot maintenance ---
+
+    def _tombstone(self, offset: int):
+        """
+        Marks the live record at `offset` as deleted, drops it from the
+        current indexes and records its slot on the avail list.
+        """
+        old = self._read_record(offset)
+        indexes, has_stats = self._sidecars()
+        self._write_at(offset, FileManager._tombstone_marker(self.metadata))
+
+        for index in indexes:
+            index.remove(self.filename, index.key_of(old), offset)
+        if has_stats:
+            FileManager.STATS.update(self.filename, removed=[old])
+        FileManager.AVAIL_LIST.push(self.filename, offset)
+        FileManager._notify(self.filename, 'delete', [old])
+
+    def _pop_free_slot(self):
+        """
+        Pops a reusable slot off the avail list, or returns None. Entries
+        that no longer point at a tombstoned slot are discarded.
+        """
+        marker = FileManager._tombstone_marker(self.metadata)
+        while True:
+            offset = FileManager.AVAIL_LIST.pop(self.filename)
+            if offset is None:
+                return None
+            if offset < self.header_len or (offset - self.header_len) % self.stride:
+                continue
+            if self._read_at(offset, len(marker)) == marker:
+                return offset
+
+    def _overwrite(self, offset: int, student: Student):
+        """
+        Writes a FIXED or BINARY record over the one at `offset` and keeps
+        the current indexes in step. Returns the record it replaced, or None
+        if the slot was deleted.
+        """
+        indexes, has_stats = self._sidecars()
+        record = FileManager._encode_record(student, self.metadata)
+        FileManager._clear_sorted(self.filename, self.metadata)
+
+        old = FileManager._parse_line(self._read_at(offset, len(record)), self.metadata)
+        self._write_at(offset, record)
+
+        stored = self._as_stored(student, record)
+        for index in indexes:
+            old_key = index.key_of(old) if old is not None else None
+            new_key = index.key_of(stored)
+            if old_key == new_key:
+                index.touch(self.filename)
+                continue
+            if old is not None:
+                index.remove(self.filename, old_key, offset)
+            index.insert(self.filename, new_key, offset)
+
+        if has_stats:
+            added = {}
+            DeptStats.accumulate(added, stored)
+            FileManager.STATS.update(self.filename, added, [old] if old is not None else [])
+        return old
+
+    def _as_stored(self, student: Student, record: bytes):
+        """
+        Returns the student as it reads back from its encoded record, so
+        index keys and stats match the stored values (see
+        FileManager._as_stored).
+        """
+        return FileManager._as_stored([student], record + self.terminator, self.stride, self.metadata)[0]
+
+    def _binary_search_id(self, student_id: int):
+        """
+        Binary search over the RRNs of a FIXED or BINARY file sorted by ID.
+        Deleted slots are skipped by probing forward to the next live one.
+        """
+        size = FileManager._record_size(self.metadata)
+        lo, hi = 0, (self._reader().seek(0, os.SEEK_END) - self.header_len) // self.stride
+        while lo < hi:
+            mid = (lo + hi) // 2
+            # First live record at or after mid, within [mid, hi)
+            probe, student = mid, None
+            while probe < hi and student is None:
+                raw = self._read_at(self.header_len + probe * self.stride, size)
+                try:
+                    student = FileManager._decode_slot(raw, 0, self.metadata)
+                except ValueError:
+                    probe += 1
+            if student is None or student.id > student_id:
+                hi = mid
+            elif student.id < student_id:
+                lo = probe + 1
+            else:
+                return student
+        return None
@@ -1,6 +1,9 @@
 from student import Student
 from file_manager import FileManager
+from columnar import ColumnarFormat
+import gzip
 import os
+import struct
 
 def test_fixed_length():
     print("--- Testing Fixed Length ---")
@@ -67,10 +70,511 @@ def test_delimited():
     assert students[0].name == "Charlie"
     print("Read verification passed.")
 
+def test_binary():
+    print("\n--- Testing Binary ---")
+    filename = "test_binary.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+        
+    # Create
+    FileManager.create_file(filename, FileManager.TYPE_BINARY)
+    with open(filename, 'rb') as f:
+        header_len = len(f.readline())
+    print("File created.")
+    
+    # Add: packed records follow the header with no newlines
+    FileManager.add_student(filename, Student(1, "Alice", 3.8, "CS"))
+    FileManager.add_student(filename, Student(2, "Bob", 3.5, "Math"))
+    FileManager.add_student(filename, Student(3, "Carol", 2.9, "EE"))
+    size = header_len + 3 * Student.BINARY_STRUCT.size
+    assert os.path.getsize(filename) == size
+    print("Students added.")
+    
+    # Read: GPAs are stored as float32 and come back rounded to 2 places
+    students = FileManager.read_all(filename)
+    assert [s.id for s in students] == [1, 2, 3]
+    assert students[0].name == "Alice" and students[0].gpa == 3.8
+    assert students[2].gpa == 2.9
+    print("Read verification passed.")
+    
+    # RRN
+    s_rrn = FileManager.get_record_by_rrn(filename, 1)
+    assert s_rrn.name == "Bob" and s_rrn.gpa == 3.5
+    assert FileManager.get_record_by_rrn(filename, 3) is None
+    print("RRN passed.")
+    
+    # Update in place, by ID and by RRN
+    assert FileManager.update_student(filename, 2, Student(2, "Robert", 3.67, "Math"))
+    assert FileManager.update_record_by_rrn(filename, 2, Student(3, "Caroline", 3.1, "EE"))
+    assert FileManager.get_record_by_rrn(filename, 1).name == "Robert"
+    assert FileManager.get_record_by_rrn(filename, 1).gpa == 3.67
+    assert FileManager.search_student(filename, 3)[0].name == "Caroline"
+    assert os.path.getsize(filename) == size
+    print("Update passed.")
+    
+    # Delete: the slot is tombstoned with the reserved ID
+    assert FileManager.delete_student(filename, 1)
+    with open(filename, 'rb') as f:
+        f.seek(header_len)
+        assert f.read(len(FileManager.BINARY_TOMBSTONE)) == FileManager.BINARY_TOMBSTONE
+    assert FileManager.get_record_by_rrn(filename, 0) is None
+    assert FileManager.search_student(filename, 1)[0] is None
+    assert [s.id for s in FileManager.read_all(filename)] == [2, 3]
+    print("Delete passed.")
+    
+    # Reuse: the next add fills the deleted slot instead of growing the file
+    FileManager.add_student(filename, Student(4, "Dave", 3.0, "ME"))
+    assert FileManager.get_record_by_rrn(filename, 0).name == "Dave"
+    assert FileManager.search_student(filename, 4)[0].name == "Dave"
+    assert os.path.getsize(filename) == size
+    print("Slot reuse passed.")
+
+def test_block_archive():
+    print("\n--- Testing Block-Compressed Archive ---")
+    filename = "test_archive.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+        
+    # Create
+    FileManager.create_file(filename, FileManager.TYPE_FIXED)
+    FileManager.add_students(filename, [Student(i, f"Student{i}", 2.5, "CS") for i in range(1, 101)])
+    with open(filename, 'rb') as f:
+        original = f.read()
+    print("File created.")
+    
+    # Compress: the header and every 16 records are separate gzip members
+    archive = FileManager.compress_file_blocks(filename, block_records=16)
+    assert archive == filename + ".gz"
+    print("Archive created.")
+    
+    # Search and RRN access read single blocks of the archive
+    s, t = FileManager.search_student(archive, 42)
+    assert s.name == "Student42"
+    assert FileManager.search_student(archive, 1000)[0] is None
+    print(f"Archive search passed. Time: {t}ms")
+    
+    assert FileManager.get_record_by_rrn(archive, 0).id == 1
+    assert FileManager.get_record_by_rrn(archive, 99).id == 100
+    assert FileManager.get_record_by_rrn(archive, 100) is None
+    print("Archive RRN passed.")
+    
+    students, total = FileManager.read_page(archive, 1, 10)
+    assert [s.id for s in students] == list(range(11, 21)) and total == 100
+    print("Archive paging passed.")
+    
+    # Decompress: the archive restores the original file byte for byte
+    os.remove(filename)
+    assert FileManager.decompress_file(archive) == filename
+    with open(filename, 'rb') as f:
+        assert f.read() == original
+    print("Decompress passed.")
+
+def test_gzip_members():
+    print("\n--- Testing Gzip Members ---")
+    filename = "test_gzip.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+        
+    # One member: a standard gzip stream whose extra field holds its size
+    member = FileManager._gzip_member(b"hello students", 9)
+    assert gzip.decompress(member) == b"hello students"
+    assert member[3] & 4  # FEXTRA
+    field_id, field_len, member_size = struct.unpack('<2sHQ', member[12:24])
+    assert field_id == FileManager.GZIP_SIZE_FIELD and field_len == 8
+    assert member_size == len(member)
+    print("Member framing passed.")
+    
+    # Create a file spanning several GZIP_CHUNK_SIZE members
+    FileManager.create_file(filename, FileManager.TYPE_FIXED)
+    FileManager.add_students(filename, [Student(i, f"Student{i}", 3.0, "Math") for i in range(1, 60001)])
+    with open(filename, 'rb') as f:
+        original = f.read()
+    assert len(original) > 2 * FileManager.GZIP_CHUNK_SIZE
+    print("File created.")
+    
+    # Compress in parallel; any gzip reader sees the original bytes
+    compressed = FileManager.compress_file(filename, workers=4)
+    spans = FileManager._gzip_member_spans(compressed)
+    assert spans is not None and len(spans) >= 3
+    with gzip.open(compressed, 'rb') as f:
+        assert f.read() == original
+    print("Parallel compress passed.")
+    
+    # Decompress member by member in parallel
+    os.remove(filename)
+    assert FileManager.decompress_file(compressed, workers=4) == filename
+    with open(filename, 'rb') as f:
+        assert f.read() == original
+    print("Parallel decompress passed.")
+
+def test_columnar():
+    print("\n--- Testing Columnar ---")
+    filename = "test_columnar.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+        
+    # Create a FIXED file larger than one row group
+    FileManager.create_file(filename, FileManager.TYPE_FIXED)
+    FileManager.add_students(filename, [Student(i, f"Student{i}", 2.0 + (i % 20) / 10, "CS") for i in range(1, 20001)])
+    original = FileManager.read_all(filename)
+    print("File created.")
+    
+    # Convert FIXED -> COLUMNAR: one row group per BATCH_SIZE records
+    columnar = FileManager.convert_file_structure(filename, FileManager.TYPE_COLUMNAR)
+    assert FileManager.get_file_metadata(columnar)['TYPE'] == FileManager.TYPE_COLUMNAR
+    with open(columnar, 'rb') as f:
+        groups = list(ColumnarFormat.iter_groups(f, len(f.readline())))
+    assert len(groups) > 1 and sum(g.rows for g in groups) == 20000
+    students = FileManager.read_all(columnar)
+    assert [(s.id, s.name, s.gpa, s.dept) for s in students] == [(s.id, s.name, s.gpa, s.dept) for s in original]
+    print("Convert to columnar passed.")
+    
+    # Zone maps rule out the first group; results match a full scan
+    assert not ColumnarFormat.may_match(groups[0], 'id', 'gte', 15000)
+    pruned = FileManager.query(columnar).where(id__gte=15000).select("id", "gpa").all()
+    scanned = [{'id': s.id, 'gpa': s.gpa} for s in students if s.id >= 15000]
+    assert pruned == scanned and len(pruned) == 5001
+    print("Zone-map query passed.")
+    
+    # RRN access skips whole row groups
+    assert FileManager.get_record_by_rrn(columnar, 0).id == 1
+    assert FileManager.get_record_by_rrn(columnar, groups[0].rows).id == groups[0].rows + 1
+    assert FileManager.get_record_by_rrn(columnar, 19999).name == "Student20000"
+    assert FileManager.get_record_by_rrn(columnar, 20000) is None
+    print("Columnar RRN passed.")
+    
+    # Convert back COLUMNAR -> FIXED
+    fixed = FileManager.convert_file_structure(columnar, FileManager.TYPE_FIXED)
+    students = FileManager.read_all(fixed)
+    assert [(s.id, s.name, s.gpa, s.dept) for s in students] == [(s.id, s.name, s.gpa, s.dept) for s in original]
+    print("Convert back to fixed passed.")
+
+def test_index_delta_log():
+    print("\n--- Testing Index Delta Log ---")
+    filename = "test_index.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+    index = FileManager.ID_INDEX
+    
+    def index_matches_file():
+        metadata = FileManager.get_file_metadata(filename)
+        on_disk = sorted((s.id, offset) for offset, s in FileManager._iter_with_offsets(filename, metadata))
+        return index.entries(filename) == on_disk and index.count(filename) == len(on_disk)
+        
+    # Create, then build the ID index with a first search
+    FileManager.create_file(filename, FileManager.TYPE_FIXED)
+    FileManager.add_students(filename, [Student(i, f"Student{i}", 3.0, "CS") for i in range(1, 301, 2)])
+    assert FileManager.search_student(filename, 1)[0].name == "Student1"
+    assert not os.path.exists(index.delta_path(filename))
+    print("Index built.")
+    
+    # Single adds and deletes go to the delta log; reads merge it in
+    for i in range(2, 41, 2):
+        FileManager.add_student(filename, Student(i, f"Student{i}", 3.0, "CS"))
+    assert FileManager.delete_student(filename, 5)
+    assert os.path.exists(index.delta_path(filename)) and index.is_current(filename)
+    assert FileManager.search_student(filename, 20)[0].name == "Student20"
+    assert FileManager.search_student(filename, 5)[0] is None
+    assert index_matches_file()
+    print("Delta log merge passed.")
+    
+    # The log is folded into the sorted file once it holds DELTA_MAX changes
+    for i in range(1000, 1000 + index.DELTA_MAX):
+        FileManager.add_student(filename, Student(i, f"Student{i}", 3.0, "CS"))
+    assert os.path.getsize(index.delta_path(filename)) < index.DELTA_MAX * index.change.size
+    assert FileManager.search_student(filename, 1000)[0].name == "Student1000"
+    assert FileManager.search_student(filename, 22)[0].name == "Student22"
+    assert index_matches_file()
+    print("Delta log fold passed.")
+    
+    # FIXED IDs keep their first 5 digits; the index keys the stored ID
+    FileManager.add_student(filename, Student(123456, "Wide", 3.0, "CS"))
+    assert FileManager.search_student(filename, 12345)[0].name == "Wide"
+    assert FileManager.delete_student(filename, 12345)
+    assert FileManager.search_student(filename, 12345)[0] is None
+    assert index_matches_file()
+    print("Stored ID key passed.")
+
+def test_tombstones():
+    print("\n--- Testing Tombstones and Compaction ---")
+    filename = "test_tombstone.txt"
+    if os.path.exists(filename):
+        os.remove(filename)
+        
+    # Create ten records at RRNs 0-9
+    FileManager.create_file(filename, FileManager.TYPE_FIXED)
+    FileManager.add_students(filename, [Student(i, f"Student{i}", 3.0, "CS") for i in range(1, 11)])
+    size = os.path.getsize(filename)
+    print("File created.")
+    
+    # Delete: slots are tombstoned in place and pushed on the avail list
+    assert FileManager.delete_student(filename, 3)
+    assert FileManager.delete_student(filename, 7)
+    assert not FileManager.delete_student(filename, 7)
+    assert os.path.getsize(filename) == size
+    assert FileManager.get_record_by_rrn(filename, 2) is None
+    assert FileManager.get_record_by_rrn(filename, 6) is None
+    assert FileManager.AVAIL_LIST.count(filename) == 2
+    print("Tombstone delete passed.")
+    
+    # Reuse: an add fills one deleted slot, an RRN update the other
+    FileManager.add_student(filename, Student(11, "Student11", 3.0, "CS"))
+    assert os.path.getsize(filename) == size
+    assert FileManager.AVAIL_LIST.count(filename) == 1
+    free = [rrn for rrn in (2, 6) if FileManager.get_record_by_rrn(filename, rrn) is None]
+    assert len(free) == 1
+    assert FileManager.update_record_by_rrn(filename, free[0], Student(12, "Student12", 3.0, "CS"))
+    assert FileManager.AVAIL_LIST.count(filename) == 0
+    assert FileManager.search_student(filename, 11)[0].name == "Student11"
+    assert FileManager.search_student(filename, 12)[0].name == "Student12"
+    assert not FileManager._needs_compaction(filename)
+    print("Slot reuse passed.")
+    
+    # Compaction runs once COMPACT_RATIO of the slots are dead
+    for student_id in (1, 2, 4, 5):
+        assert FileManager.delete_student(filename, student_id)
+    assert os.path.getsize(filename) == size
+    assert FileManager.delete_student(filename, 6)
+    assert FileManager.AVAIL_LIST.count(filename) == 0
+    remaining = [s.id for s in FileManager.read_all(filename)]
+    assert sorted(remaining) == [8, 9, 10, 11, 12]
+    assert os.path.getsize(filename) < size
+    assert FileManager.get_record_by_rrn(filename, len(remaining)) is None
+    assert FileManager.search_student(filename, 10)[0].name == "Student10"
+    assert FileManager.search_student(filename, 6)[0] is None
+    print("Auto-compaction passed.")
+
+def test_secondary_indexes():
+    print("\n--- Testing Dept and Name Indexes ---")
+    filename = "test_secondary.txt"
+    for file_type in (FileManager.TYPE_FIXED, FileManager.TYPE_BINARY):
+        if os.path.exists(filename):
+            os.remove(filename)
+            
+        # Create, then build both indexes with a first lookup
+        FileManager.create_file(filename, file_type)
+        FileManager.add_students(filename, [Student(1, "Alice", 3.8, "CS"), Student(2, "Bob", 3.5, "Math"),
+                                            Student(3, "alfred", 2.9, "CS")])
+        assert [s.id for s in FileManager.find_by_dept(filename, "CS")] == [1, 3]
+        assert [s.id for s in FileManager.find_by_name_prefix(filename, "AL")] == [3, 1]
+        assert FileManager.query(filename).where(dept="Math").explain() == "index:dept"
+        print(f"{file_type} indexes built.")
+        
+        # Adds, updates and deletes keep both indexes current. Padding
+        # spaces are not stored, so the keys don't keep them either.
+        FileManager.add_student(filename, Student(4, " Alan", 3.1, "  Math"))
+        FileManager.add_students(filename, [Student(5, "Albert ", 3.3, "Math ")])
+        assert FileManager.update_student(filename, 1, Student(1, "Zoe", 3.8, "Physics"))
+        assert FileManager.delete_student(filename, 2)
+        assert [s.id for s in FileManager.find_by_dept(filename, "Math")] == [4, 5]
+        assert [s.id for s in FileManager.find_by_dept(filename, "CS")] == [3]
+        assert [s.id for s in FileManager.find_by_dept(filename, "Physics")] == [1]
+        assert [s.name for s in FileManager.find_by_name_prefix(filename, "al")] == ["Alan", "Albert", "alfred"]
+        assert [s.id for s in FileManager.find_by_name_prefix(filename, "al", limit=1)] == [4]
+        assert FileManager.find_by_name_prefix(filename, "Bob") == []
+        assert [s.id for s in FileManager.query(filename).where(dept="Math")] == [4, 5]
+        print(f"{file_type} index maintenance passed.")
+
+def test_gpa_index():
+    print("\n--- Testing GPA Index ---")
+    filename = "test_gpa.txt"
+    for file_type in (FileManager.TYPE_FIXED, FileManager.TYPE_BINARY):
+        if os.path.exists(filename):
+            os.remove(filename)
+            
+        # Create, then build the index with a first range query
+        FileManager.create_file(filename, file_type)
+        FileManager.add_students(filename, [Student(1, "Alice", 3.8, "CS"), Student(2, "Bob", 2.5, "Math"),
+                                            Student(3, "Carol", 3.1, "EE")])
+        assert [s.id for s in FileManager.find_by_gpa_range(filename, 3.0, 4.0)] == [3, 1]
+        print(f"{file_type} index built.")
+        
+        # GPAs are stored to 2 places: 3.456 is kept and indexed as 3.46
+        FileManager.add_student(filename, Student(4, "Dave", 3.456, "CS"))
+        FileManager.add_students(filename, [Student(5, "Eve", 3.999, "EE")])
+        assert [s.gpa for s in FileManager.find_by_gpa_range(filename, 3.46, 3.46)] == [3.46]
+        assert [s.id for s in FileManager.top_by_gpa(filename, 2)] == [5, 1]
+        print(f"{file_type} stored GPA passed.")
+        
+        # Updates and deletes move or drop the entries
+        assert FileManager.update_student(filename, 4, Student(4, "Dave", 1.0, "CS"))
+        assert FileManager.delete_student(filename, 5)
+        assert FileManager.find_by_gpa_range(filename, 3.4, 3.5) == []
+        assert [s.id for s in FileManager.find_by_gpa_range(filename, 0.0, 4.0)] == [4, 2, 3, 1]
+        assert [s.id for s in FileManager.top_by_gpa(filename, 10)] == [1, 3, 2, 4]
+        students, total = FileManager.read_page(filename, 0, 3, sort_by="gpa")
+        assert [s.id for s in students] == [4, 2, 3] and total == 4
+        students, _ = FileManager.read_page(filename, 0, 3, sort_by="gpa", descending=True)
+        assert [s.id for s in students] == [1, 3, 2]
+        students, _ = FileManager.read_page(filename, 1, 3, sort_by="gpa")
+        assert [s.id for s in students] == [1]
+        print(f"{file_type} index maintenance passed.")
+
+def test_department_stats():
+    print("\n--- Testing Department Stats ---")
+    filename = "test_stats.txt"
+    
+    def expected_stats():
+        depts = {}
+        for s in FileManager.read_all(filename):
+            depts.setdefault(s.dept, []).append(s.gpa)
+        return {dept: (len(gpas), round(sum(gpas) / len(gpas), 6), min(gpas), max(gpas))
+                for dept, gpas in sorted(depts.items())}
+        
+    def stats():
+        return {dept: (agg['count'], round(agg['mean'], 6), agg['min'], agg['max'])
+                for dept, agg in FileManager.department_stats(filename).items()}
+        
+    for file_type in (FileManager.TYPE_FIXED, FileManager.TYPE_BINARY):
+        if os.path.exists(filename):
+            os.remove(filename)
+            
+        # Create, then build the sidecar with a first read
+        FileManager.create_file(filename, file_type)
+        FileManager.add_students(filename, [Student(1, "Alice", 3.8, "CS"), Student(2, "Bob", 2.5, "CS"),
+                                            Student(3, "Carol", 3.1, "EE")])
+        assert stats() == {"CS": (2, 3.15, 2.5, 3.8), "EE": (1, 3.1, 3.1, 3.1)}
+        print(f"{file_type} stats built.")
+        
+        # Adds update the sidecar in place with the GPA as stored
+        FileManager.add_student(filename, Student(4, "Dave", 3.456, "CS"))
+        FileManager.add_students(filename, [Student(5, "Eve", 1.234, "EE")])
+        assert FileManager.STATS.is_current(filename)
+        assert stats() == expected_stats() and stats()["CS"][3] == 3.8
+        print(f"{file_type} stats adds passed.")
+        
+        # Updates and deletes subtract the old record; removing a min or max
+        # makes the sidecar rebuild on its next read
+        assert FileManager.update_student(filename, 4, Student(4, "Dave", 1.0, "CS"))
+        assert FileManager.STATS.is_current(filename)
+        assert stats() == expected_stats()
+        assert FileManager.update_student(filename, 2, Student(2, "Bob", 2.5, "EE"))
+        assert FileManager.delete_student(filename, 1)
+        assert stats() == expected_stats() == {"CS": (1, 1.0, 1.0, 1.0), "EE": (3, 2.276667, 1.23, 3.1)}
+        print(f"{file_type} stats maintenance passed.")
+
+def test_sort():
+    print("\n--- Testing External Sort ---")
+    filename = "test_sort.txt"
+    run_records, fan_in = FileManager.SORT_RUN_RECORDS, FileManager.SORT_MERGE_FAN_IN
+    try:
+        # Small runs and fan-in force intermediate merge passes
+        FileManager.SORT_RUN_RECORDS, FileManager.SORT_MERGE_FAN_IN = 50, 4
+        for file_type in (FileManager.TYPE_FIXED, FileManager.TYPE_BINARY):
+            if os.path.exists(filename):
+                os.remove(filename)
+                
+            # Create 500 records in shuffled ID order, some of them deleted
+            FileManager.create_file(filename, file_type)
+            FileManager.add_students(filename, [Student(i * 37 % 500 + 1, f"Student{i}", 2.0 + i % 20 / 10, "CS")
+                                                for i in range(500)])
+            for student_id in (1, 250, 500):
+                assert FileManager.delete_student(filename, student_id)
+            print(f"{file_type} file created.")
+            
+            # Sort by ID: deleted slots are dropped and the header is marked
+            FileManager.sort_file(filename, "id")
+            assert FileManager.get_file_metadata(filename)['SORTED'] == "ID"
+            ids = [s.id for s in FileManager.read_all(filename)]
+            assert ids == [i for i in range(1, 501) if i not in (1, 250, 500)]
+            assert [f for f in os.listdir('.') if f.startswith(filename + ".run")] == []
+            print(f"{file_type} sort passed.")
+            
+            # Binary search on the sorted file skips slots deleted after sorting
+            for student_id in (2, 3, 100, 101, 102, 499):
+                assert FileManager.delete_student(filename, student_id)
+            for student_id in (1, 2, 3, 100, 101, 102, 250, 499, 500, 501):
+                assert FileManager.search_student(filename, student_id)[0] is None
+            for student_id in (4, 99, 103, 249, 251, 498):
+                assert FileManager.search_student(filename, student_id)[0].id == student_id
+            assert FileManager.get_file_metadata(filename)['SORTED'] == "ID"
+            students, total = FileManager.read_page(filename, 0, 3, sort_by="id", descending=True)
+            assert [s.id for s in students] == [498, 497, 496] and total == 491
+            print(f"{file_type} sorted search passed.")
+            
+            # Sort by GPA; a later add clears the mark
+            FileManager.sort_file(filename, "gpa")
+            gpas = [s.gpa for s in FileManager.read_all(filename)]
+            assert gpas == sorted(gpas) and len(gpas) == 491
+            FileManager.add_student(filename, Student(600, "New", 3.0, "CS"))
+            assert FileManager._sorted_by(FileManager.get_file_metadata(filename)) is None
+            assert FileManager.search_student(filename, 600)[0].name == "New"
+            print(f"{file_type} sort by GPA passed.")
+    finally:
+        FileManager.SORT_RUN_RECORDS, FileManager.SORT_MERGE_FAN_IN = run_records, fan_in
+
+def test_student_file():
+    print("\n--- Testing StudentFile Sessions ---")
+    filename = "test_session.txt"
+    for file_type in (FileManager.TYPE_FIXED, FileManager.TYPE_BINARY, FileManager.TYPE_DELIMITED):
+        if os.path.exists(filename):
+            os.remove(filename)
+        FileManager.create_file(filename, file_type)
+        
+        with FileManager.open(filename) as records:
+            # Changes made through the session are visible to it and to others
+            for i in range(1, 11):
+                records.add(Student(i, f"Student{i}", 3.0, "CS"))
+            assert records.search(4).name == "Student4"
+            assert records.update(4, Student(4, "Dan", 3.5, "EE"))
+            assert not records.update(40, Student(40, "Nobody", 3.5, "EE"))
+            assert records.search(4).name == "Dan"
+            assert FileManager.search_student(filename, 4)[0].name == "Dan"
+            assert [s.dept for s in FileManager.find_by_dept(filename, "EE")] == ["EE"]
+            
+            if file_type == FileManager.TYPE_DELIMITED:
+                try:
+                    records.get(0)
+                    assert False, "RRN access on a delimited file should fail"
+                except ValueError:
+                    pass
+            else:
+                assert records.get(0).id == 1
+                assert records.get(-1) is None and records.get(-5) is None and records.get(10) is None
+                assert records.update_at(9, Student(20, "Student20", 3.0, "CS"))
+                assert not records.update_at(10, Student(21, "Student21", 3.0, "CS"))
+                assert records.get(9).id == 20 and records.search(10) is None
+                
+            # Deleting past COMPACT_RATIO compacts and reopens the file
+            for student_id in (1, 2, 3, 5, 6):
+                assert records.delete(student_id)
+            assert not records.delete(1)
+            assert FileManager.AVAIL_LIST.count(filename) == 0
+            expected = [4, 7, 8, 9, 10] if file_type == FileManager.TYPE_DELIMITED else [4, 7, 8, 9, 20]
+            assert sorted(s.id for s in records.scan()) == expected
+            records.add(Student(30, "Student30", 3.0, "CS"))
+            assert records.search(30).name == "Student30" and records.search(7).id == 7
+        
+        assert sorted(s.id for s in FileManager.read_all(filename)) == sorted(expected + [30])
+        print(f"{file_type} session passed.")
+        
+    # Block-compressed archives have no record offsets to work with
+    archive = FileManager.compress_file_blocks(filename)
+    for call in (lambda: FileManager.open(archive), lambda: FileManager.query(archive).where(id=7).all(),
+                 lambda: FileManager.find_by_dept(archive, "CS")):
+        try:
+            call()
+            assert False, "Record-level access to an archive should fail"
+        except ValueError:
+            pass
+    assert FileManager.search_student(archive, 7)[0].id == 7
+    print("Archive rejection passed.")
+
 if __name__ == "__main__":
     try:
         test_fixed_length()
         test_delimited()
+        test_binary()
+        test_block_archive()
+        test_gzip_members()
+        test_columnar()
+        test_index_delta_log()
+        test_tombstones()
+        test_secondary_indexes()
+        test_gpa_index()
+        test_department_stats()
+        test_sort()
+        test_student_file()
         print("\nALL TESTS PASSED!")
     except AssertionError as e:
         print(f"\nTEST FAILED: {e}")